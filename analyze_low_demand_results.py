@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 # Path to the results CSV file
@@ -6,59 +7,96 @@ csv_path = "results/low_demand/event_driven_results_low.csv"
 # Load the CSV file
 df = pd.read_csv(csv_path)
 
-def flag_inconsistencies(row):
-    issues = []
+# Defaults for columns the checks read, applied once up front so the
+# vectorized checks never have to guard against a missing column
+_CHECK_COLUMN_DEFAULTS = {
+    'coordination_mode': '',
+    'interference_mitigation': '',
+    'licensing_mode': '',
+    'Num_Interfering_Assignments': 0,
+    'Requests_Total': 0,
+    'Requests_Denied': 0,
+    'Blocking_Prob': 0.0,
+    'Mean_Quality': 1.0,
+    'SUE': 0.0,
+    'Correct_SUE': 0.0,
+    'Total_Active_Users': 0,
+    'Interference_Rate': 0.0,
+    'Coordination_Cost': 0.0,
+}
+
+def flag_inconsistencies(df):
+    """
+    Build one boolean mask per consistency check over the whole DataFrame.
+    All checks are elementwise, so they run as vectorized column operations
+    instead of a per-row Python loop.
+    Returns a dict {issue_text: boolean Series}.
+    """
+    for column, default in _CHECK_COLUMN_DEFAULTS.items():
+        if column not in df.columns:
+            df = df.assign(**{column: default})
+    masks = {}
     # 1. Interference in Centralized/No Mitigation
-    if row.get('coordination_mode') == 'Centralized' and row.get('interference_mitigation') == 'No Mitigation':
-        if row.get('Num_Interfering_Assignments', 0) > 0:
-            issues.append("Interference in Centralized/No Mitigation mode.")
+    masks["Interference in Centralized/No Mitigation mode."] = (
+        df['coordination_mode'].eq('Centralized')
+        & df['interference_mitigation'].eq('No Mitigation')
+        & df['Num_Interfering_Assignments'].gt(0)
+    )
     # 2. Blocking probability logic
-    if row.get('Requests_Total', 0) > 0:
-        blocking_prob = row.get('Blocking_Prob', 0)
-        denied = row.get('Requests_Denied', 0)
-        total = row.get('Requests_Total', 1)
-        expected_blocking = denied / total
-        if abs(blocking_prob - expected_blocking) > 0.01:
-            issues.append("Blocking_Prob does not match Requests_Denied/Requests_Total.")
+    expected_blocking = df['Requests_Denied'] / df['Requests_Total'].replace(0, np.nan)
+    masks["Blocking_Prob does not match Requests_Denied/Requests_Total."] = (
+        df['Requests_Total'].gt(0)
+        & (df['Blocking_Prob'] - expected_blocking).abs().gt(0.01)
+    )
     # 3. Mean Quality check
-    if not (0 <= row.get('Mean_Quality', 1) <= 1):
-        issues.append("Mean_Quality out of [0,1] range.")
+    masks["Mean_Quality out of [0,1] range."] = ~df['Mean_Quality'].between(0, 1)
     # 4. SUE and Correct_SUE should be close
-    if abs(row.get('SUE', 0) - row.get('Correct_SUE', 0)) > 0.1:
-        issues.append("SUE and Correct_SUE differ by > 0.1.")
+    masks["SUE and Correct_SUE differ by > 0.1."] = (df['SUE'] - df['Correct_SUE']).abs().gt(0.1)
     # 5. Negative or zero active users with nonzero granted requests
-    if row.get('Total_Active_Users', 0) <= 0 and row.get('Requests_Total', 0) > 0:
-        issues.append("Zero or negative active users despite granted requests.")
+    masks["Zero or negative active users despite granted requests."] = (
+        df['Total_Active_Users'].le(0) & df['Requests_Total'].gt(0)
+    )
     # 6. Interference rate vs. number interfering
-    if row.get('Num_Interfering_Assignments', 0) > 0 and row.get('Interference_Rate', 0) == 0:
-        issues.append("Nonzero interfering assignments but zero interference rate.")
+    masks["Nonzero interfering assignments but zero interference rate."] = (
+        df['Num_Interfering_Assignments'].gt(0) & df['Interference_Rate'].eq(0)
+    )
     # 7. Coordination cost in Manual mode
-    if row.get('licensing_mode') == 'Manual' and row.get('Coordination_Cost', 0) > 0:
-        issues.append("Coordination cost in Manual licensing mode (should typically be zero).")
-    return issues
+    masks["Coordination cost in Manual licensing mode (should typically be zero)."] = (
+        df['licensing_mode'].eq('Manual') & df['Coordination_Cost'].gt(0)
+    )
+    return masks
+
+# Analyze all rows at once, then report per row
+masks = flag_inconsistencies(df)
+issues_by_row = {}
+for issue, mask in masks.items():
+    for idx in np.flatnonzero(mask.fillna(False).values):
+        issues_by_row.setdefault(idx, []).append(issue)
 
-# Analyze each row
-for idx, row in df.iterrows():
-    issues = flag_inconsistencies(row)
-    if issues:
-        print(f"Row {idx} (arch_id: {row.get('architecture_id', 'N/A')}):")
-        for issue in issues:
-            print(f"  - {issue}")
-        print("-" * 60)
+arch_ids = df['architecture_id'] if 'architecture_id' in df.columns else None
+for idx in sorted(issues_by_row):
+    arch_id = arch_ids.iloc[idx] if arch_ids is not None else 'N/A'
+    print(f"Row {idx} (arch_id: {arch_id}):")
+    for issue in issues_by_row[idx]:
+        print(f"  - {issue}")
+    print("-" * 60)
 
 print("Analysis complete.")
 
 # New: Group by coordination cost, blocking probability, and correct SUE
 def print_group_counts(df, metric_name, display_name=None):
     display_name = display_name or metric_name
-    value_counts = df[metric_name].value_counts().sort_index()
+    value_counts = df[metric_name].value_counts(sort=False).sort_index()
+    # One groupby pass gives positional indices per value, replacing the
+    # O(U*N) boolean re-filter inside the loop with O(N) total work.
+    group_indices = df.groupby(metric_name).indices
+    arch_ids = df["architecture_id"].values
     print(f"\nNumber of architectures sharing the same {display_name}:")
     for value, count in value_counts.items():
         print(f"  {display_name} = {value}: {count} architectures")
         # Optionally, print a few example architectures
-        example_archs = df[df[metric_name] == value]["architecture_id"].head(3)
-        for example in example_archs:
-            print(f"    Example: {example}")
+        for idx in group_indices[value][:3]:
+            print(f"    Example: {arch_ids[idx]}")
         if count > 3:
             print(f"    ...and {count-3} more.")
 
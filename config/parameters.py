@@ -3,6 +3,10 @@ Simulation configuration parameters.
 """
 RANDOM_SEED = 42
 
+# Per-request lifecycle traces allocate a formatted string per event; disable
+# them for large sweeps where traces are never inspected.
+TRACE_ENABLED = False
+
 # Request parameter bounds (in MHz)
 MIN_BW_REQUEST = 10    # in MHz
 MAX_BW_REQUEST = 100   # in MHz
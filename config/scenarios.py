@@ -5,6 +5,7 @@ Defines three deterministic demand scenarios with varying arrival patterns.
 from typing import Dict, List, Tuple, Mapping
 from collections import namedtuple
 from types import MappingProxyType
+import numpy as np
 
 # Constants
 _MIN_PER_DAY = 1440
@@ -13,7 +14,7 @@ DEFAULT_SIM_MINUTES = _SIM_MINUTES
 
 # Scenario definition type
 Scenario = namedtuple('Scenario', [
-    'arrival_minutes',  # List of minutes when requests arrive
+    'arrival_minutes',  # Sorted int64 array of minutes when requests arrive
     'device_dist',      # Distribution of device types (device_type, probability)
     'bw_dist'           # Bandwidth distribution per device type {device_type: [(bw, probability)]}
 ])
@@ -21,7 +22,7 @@ Scenario = namedtuple('Scenario', [
 # Scenario definitions
 _scenarios = {
     "low": Scenario(
-        arrival_minutes=list(range(0, _SIM_MINUTES, (_MIN_PER_DAY * 7) // 2)),  # 2 users per week (every 3.5 days)
+        arrival_minutes=np.arange(0, _SIM_MINUTES, (_MIN_PER_DAY * 7) // 2, dtype=np.int64),  # 2 users per week (every 3.5 days)
         device_dist=[("5G", 0.5), ("IoT", 0.35), ("Federal", 0.15)],
         bw_dist={
             "5G": [(100, 0.6), (200, 0.4)],
@@ -30,7 +31,7 @@ _scenarios = {
         }
     ),
     "medium": Scenario(
-        arrival_minutes=list(range(0, _SIM_MINUTES, _MIN_PER_DAY)),  # 1 user per day
+        arrival_minutes=np.arange(0, _SIM_MINUTES, _MIN_PER_DAY, dtype=np.int64),  # 1 user per day
         device_dist=[("5G", 0.5), ("IoT", 0.35), ("Federal", 0.15)],
         bw_dist={
             "5G": [(100, 0.6), (200, 0.4)],
@@ -39,7 +40,7 @@ _scenarios = {
         }
     ),
     "high": Scenario(
-        arrival_minutes=list(range(0, _SIM_MINUTES, _MIN_PER_DAY // 2)),  # 2 users per day (every 12 hours)
+        arrival_minutes=np.arange(0, _SIM_MINUTES, _MIN_PER_DAY // 2, dtype=np.int64),  # 2 users per day (every 12 hours)
         device_dist=[("5G", 0.5), ("IoT", 0.35), ("Federal", 0.15)],
         bw_dist={
             "5G": [(100, 0.6), (200, 0.4)],
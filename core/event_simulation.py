@@ -2,17 +2,19 @@
 Event-driven simulation engine for spectrum management.
 """
 import heapq
-from collections import namedtuple
+
 from core.metrics import MetricsCollector
 from core.spectrum_manager import SpectrumManager
 from config.scenarios import DEFAULT_SIM_MINUTES
 from config.parameters import TOTAL_BANDWIDTH_MHZ
 
-# Define event types with a tie-breaker counter
-Event = namedtuple('Event', ['time', 'event_type', 'counter', 'payload'])
 # event_type: 'ARRIVAL', 'PROCESS_MANUAL', 'RENEWAL'
 
 class EventDrivenSimulation:
+    # Manual review delay by coordination mode:
+    # Centralized 30 days, Hybrid 20 days, Decentralized 10 days (minutes)
+    _DELAY_BY_MODE = {'Centralized': 43200, 'Hybrid': 28800, 'Decentralized': 14400}
+
     def __init__(self, environment, architecture_policy, demand_list, sim_minutes=DEFAULT_SIM_MINUTES):
         self.environment = environment
         self.architecture_policy = architecture_policy
@@ -21,132 +23,177 @@ class EventDrivenSimulation:
         self.metrics = MetricsCollector()
         self.spectrum_manager = SpectrumManager(environment, architecture_policy, self.metrics)
         self.results = None
-        self.event_queue = []
+        # Sparse timing wheel: minute -> event list for populated minutes
+        # only, with a min-heap of those minutes driving the walk. Demand
+        # is sparse relative to the horizon (tens of events across weeks of
+        # minutes), so storage and the run loop scale with the events, not
+        # sim_minutes; insertion order within a minute is preserved by list
+        # append, and same-minute events share one heap entry so no
+        # tie-breaker bookkeeping is needed.
+        self.event_buckets = {}
+        self._bucket_heap = []
+        self._overflow_min = None  # Earliest event time past the horizon, if any
         self.current_time = 0
         self.active_assignments = set()  # Track assignment IDs for renewal scheduling
-        self._event_counter = 0  # Tie-breaker for event queue
+        self._default_manual_delay = self._DELAY_BY_MODE.get(
+            architecture_policy.coordination_mode, self._DELAY_BY_MODE['Decentralized'])
+        # The policy never changes mid-run; resolve the licensing-mode
+        # branches once instead of comparing strings per event
+        self._mode_is_dynamic = architecture_policy.licensing_mode == 'Dynamic'
+        self._mode_is_semi = architecture_policy.licensing_mode == 'Semi-Dynamic'
+        # Method-table dispatch: one dict probe per event instead of chained
+        # string comparisons, with the handler set specialized by mode (e.g.
+        # Manual arrivals are a no-op until their PROCESS_MANUAL event fires)
+        if self._mode_is_semi:
+            arrival_handler = self._handle_arrival_semi_dynamic
+            renewal_handler = self._handle_renewal
+        elif self._mode_is_dynamic:
+            arrival_handler = self._handle_arrival_dynamic
+            renewal_handler = self._handle_noop
+        else:
+            arrival_handler = self._handle_noop
+            renewal_handler = self._handle_noop
+        self._event_handlers = {
+            'ARRIVAL': arrival_handler,
+            'PROCESS_MANUAL': self._handle_process_manual,
+            'RENEWAL': renewal_handler,
+        }
 
     def schedule_event(self, event_time, event_type, payload):
-        self._event_counter += 1
-        heapq.heappush(self.event_queue, Event(event_time, event_type, self._event_counter, payload))
+        if event_time > self.sim_minutes:
+            # Past the horizon: never processed, but remember the earliest
+            # such time so the metrics cut-off matches the event order.
+            if self._overflow_min is None or event_time < self._overflow_min:
+                self._overflow_min = event_time
+            return
+        bucket = self.event_buckets.get(event_time)
+        if bucket is None:
+            bucket = self.event_buckets[event_time] = []
+            heapq.heappush(self._bucket_heap, event_time)
+        bucket.append((event_type, payload))
+
+    def _accrue_interval_metrics(self, last_update_time, until):
+        """
+        Accrue usage and coordination-cost metrics for the quiet interval
+        [last_update_time, until). Shared by the per-event loop and the final
+        flush so the licensing-mode arithmetic lives in one place.
+        """
+        delta_t = until - last_update_time
+        if delta_t <= 0:
+            return
+        spectrum_manager = self.spectrum_manager
+        # _mode_is_dynamic/_mode_is_semi are resolved once in __init__ so the
+        # per-event path branches on booleans, not string comparisons, and
+        # n_active is the manager's maintained counter rather than a len() call
+        if self._mode_is_dynamic:
+            increment = spectrum_manager.n_active * delta_t
+            self.metrics.coordination_cost += increment
+            self.metrics.coord_queries += increment
+        elif self._mode_is_semi:
+            # Only increment for each full day elapsed since last update
+            days_elapsed = (until - self._last_semi_dynamic_update) // 1440
+            if days_elapsed > 0:
+                increment = spectrum_manager.n_active * days_elapsed
+                self.metrics.coordination_cost += increment
+                self.metrics.coord_queries += increment
+                self._last_semi_dynamic_update += days_elapsed * 1440
+        self.metrics.update_usage(spectrum_manager.active, self.environment, delta_t)
+
+    def _handle_noop(self, payload):
+        # Installed for event types that are inert under the current mode
+        pass
+
+    def _handle_arrival_dynamic(self, payload):
+        self.spectrum_manager.process_arrivals([payload], self.current_time)
+
+    def _handle_arrival_semi_dynamic(self, payload):
+        self.spectrum_manager.process_arrivals([payload], self.current_time)
+        # Schedule next universal renewal at next 24h boundary if not already scheduled
+        next_renewal_time = ((self.current_time // 1440) + 1) * 1440
+        if next_renewal_time <= self.sim_minutes:
+            self.schedule_event(next_renewal_time, 'RENEWAL', None)
+
+    def _handle_process_manual(self, payload):
+        self.spectrum_manager.process_arrivals([payload], self.current_time)
+        # Add human minutes: each processed manual request incurs the coordination delay as human review time
+        self.metrics.human_minutes += getattr(payload, 'manual_delay', self._default_manual_delay)
+
+    def _handle_renewal(self, payload):
+        self.spectrum_manager.renew_assignments(self.current_time)
+        # Schedule next daily renewal while the horizon allows
+        next_renewal_time = self.current_time + 1440
+        if next_renewal_time <= self.sim_minutes:
+            self.schedule_event(next_renewal_time, 'RENEWAL', None)
 
     def run(self):
-        # Schedule all demand arrivals
+        # Build the initial wheel in one pass over the demand list, with the
+        # bucket lookup and heap push inlined instead of a method call per
+        # event; the rare past-horizon event still goes through
+        # schedule_event for the overflow bookkeeping. Manual mode computes
+        # process_time in the same pass rather than traversing the demand a
+        # second time.
+        buckets = self.event_buckets
+        bucket_heap = self._bucket_heap
+        heappush = heapq.heappush
+        sim_minutes = self.sim_minutes
+        is_manual = self.architecture_policy.licensing_mode == 'Manual'
+        default_delay = self._default_manual_delay
         for req in self.demand_list:
-            self.schedule_event(req.arrival_time, 'ARRIVAL', req)
-
-        # For manual mode, assign process_time to each request
-        if self.architecture_policy.licensing_mode == 'Manual':
-            for req in self.demand_list:
-                delay = getattr(req, 'manual_delay', None)
-                if delay is None:
-                    # Centralized: 30 days (43200 minutes), Hybrid: 20 days (28800), Decentralized: 10 days (14400)
-                    if self.architecture_policy.coordination_mode == 'Hybrid':
-                        delay = 28800  # 20 days
-                    elif self.architecture_policy.coordination_mode == 'Centralized':
-                        delay = 43200  # 30 days
-                    else:
-                        delay = 14400  # Decentralized: 10 days
-                    req.manual_delay = delay
-                    req.process_time = req.arrival_time + delay
-                self.schedule_event(req.process_time, 'PROCESS_MANUAL', req)
+            arrival_time = req.arrival_time
+            if arrival_time <= sim_minutes:
+                bucket = buckets.get(arrival_time)
+                if bucket is None:
+                    bucket = buckets[arrival_time] = []
+                    heappush(bucket_heap, arrival_time)
+                bucket.append(('ARRIVAL', req))
+            else:
+                self.schedule_event(arrival_time, 'ARRIVAL', req)
+            if is_manual:
+                if getattr(req, 'manual_delay', None) is None:
+                    req.manual_delay = default_delay
+                    req.process_time = arrival_time + default_delay
+                process_time = req.process_time
+                if process_time <= sim_minutes:
+                    bucket = buckets.get(process_time)
+                    if bucket is None:
+                        bucket = buckets[process_time] = []
+                        heappush(bucket_heap, process_time)
+                    bucket.append(('PROCESS_MANUAL', req))
+                else:
+                    self.schedule_event(process_time, 'PROCESS_MANUAL', req)
 
         last_update_time = 0
-        renewal_interval = None
-        last_semi_dynamic_update = 0  # Track last time cost was updated for Semi-Dynamic
-        if self.architecture_policy.licensing_mode == 'Semi-Dynamic':
-            renewal_interval = 1440  # 24 hours
-            last_semi_dynamic_update = 0
-        # Dynamic mode: no renewal_interval, only arrival events
-
-        while self.event_queue:
-            event = heapq.heappop(self.event_queue)
-            # Update metrics for the interval since last event
-            delta_t = event.time - last_update_time
-            if delta_t > 0:
-                if self.architecture_policy.licensing_mode == 'Dynamic':
-                    n_active = len(self.spectrum_manager.active)
-                    increment = n_active * delta_t
-                    self.metrics.coordination_cost += increment
-                    self.metrics.coord_queries += increment
-                    self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-                elif self.architecture_policy.licensing_mode == 'Semi-Dynamic':
-                    n_active = len(self.spectrum_manager.active)
-                    # Only increment for each full day elapsed since last update
-                    days_elapsed = (event.time - last_semi_dynamic_update) // 1440
-                    if days_elapsed > 0:
-                        increment = n_active * days_elapsed
-                        self.metrics.coordination_cost += increment
-                        self.metrics.coord_queries += increment
-                        last_semi_dynamic_update += days_elapsed * 1440
-                    self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-                else:
-                    self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-            last_update_time = event.time
-            self.current_time = event.time
-            if self.current_time > self.sim_minutes:
-                break
-            if event.event_type == 'ARRIVAL':
-                if self.architecture_policy.licensing_mode == 'Semi-Dynamic':
-                    self.spectrum_manager.process_arrivals([event.payload], self.current_time)
-                    # Schedule next universal renewal at next 24h boundary if not already scheduled
-                    next_renewal_time = ((self.current_time // renewal_interval) + 1) * renewal_interval
-                    if next_renewal_time <= self.sim_minutes:
-                        self.schedule_event(next_renewal_time, 'RENEWAL', None)
-                elif self.architecture_policy.licensing_mode == 'Dynamic':
-                    self.spectrum_manager.process_arrivals([event.payload], self.current_time)
-                # For manual, arrivals are queued and processed at process_time
-            elif event.event_type == 'PROCESS_MANUAL':
-                self.spectrum_manager.process_arrivals([event.payload], self.current_time)
-                # Add human minutes: each processed manual request incurs the coordination delay as human review time
-                if hasattr(event.payload, 'manual_delay'):
-                    self.metrics.human_minutes += event.payload.manual_delay
-                else:
-                    # Fallback to default if not set
-                    if self.architecture_policy.coordination_mode == 'Hybrid':
-                        self.metrics.human_minutes += 28800
-                    elif self.architecture_policy.coordination_mode == 'Centralized':
-                        self.metrics.human_minutes += 43200
-                    else:
-                        self.metrics.human_minutes += 14400
-            elif event.event_type == 'RENEWAL':
-                # Only for semi-dynamic
-                if self.architecture_policy.licensing_mode == 'Semi-Dynamic':
-                    self.spectrum_manager.renew_assignments(self.current_time)
-                    # Schedule next renewal if there are still active assignments
-                    if renewal_interval is not None:
-                        next_renewal_time = self.current_time + renewal_interval
-                        if next_renewal_time <= self.sim_minutes:
-                            self.schedule_event(next_renewal_time, 'RENEWAL', None)
+        self._last_semi_dynamic_update = 0  # Track last time cost was updated for Semi-Dynamic
+
+        handlers = self._event_handlers
+        buckets = self.event_buckets
+        heap = self._bucket_heap
+        # Walk the populated minutes in order; handlers only ever schedule
+        # strictly future events, so popping the current minute is safe
+        while heap:
+            t = heapq.heappop(heap)
+            bucket = buckets.pop(t)
+            # Update metrics for the interval since the last populated minute
+            self._accrue_interval_metrics(last_update_time, t)
+            last_update_time = t
+            self.current_time = t
+            for event_type, payload in bucket:
+                handlers[event_type](payload)
+
+        if self._overflow_min is not None:
+            # The old heap queue still advanced the metrics clock to the first
+            # past-horizon event before breaking; keep that cut-off.
+            self._accrue_interval_metrics(last_update_time, self._overflow_min)
+            last_update_time = self._overflow_min
+            self.current_time = self._overflow_min
 
         # Final update for any remaining time until sim_minutes
-        if last_update_time < self.sim_minutes:
-            delta_t = self.sim_minutes - last_update_time
-            if self.architecture_policy.licensing_mode == 'Dynamic':
-                n_active = len(self.spectrum_manager.active)
-                increment = n_active * delta_t
-                self.metrics.coordination_cost += increment
-                self.metrics.coord_queries += increment
-                self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-            elif self.architecture_policy.licensing_mode == 'Semi-Dynamic':
-                n_active = len(self.spectrum_manager.active)
-                # Only increment for each full day elapsed since last update
-                days_elapsed = (self.sim_minutes - last_semi_dynamic_update) // 1440
-                if days_elapsed > 0:
-                    increment = n_active * days_elapsed
-                    self.metrics.coordination_cost += increment
-                    self.metrics.coord_queries += increment
-                    last_semi_dynamic_update += days_elapsed * 1440
-                self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-            else:
-                self.metrics.update_usage(self.spectrum_manager.active, self.environment, delta_t)
-
-        # After all events processed, compute metrics with final active assignments
-        # Ensure we pass only real Assignment objects with assignment_id and freq info
-        real_assignments = [a for a in self.spectrum_manager.active if hasattr(a, 'assignment_id') and a.assignment_id is not None and hasattr(a, 'freq_start') and a.freq_start is not None]
-        if len(real_assignments) == 0:
-            print("[WARNING] No real assignments with IDs and frequencies found in self.spectrum_manager.active. Using all assignments as fallback.")
-            real_assignments = self.spectrum_manager.active
+        self._accrue_interval_metrics(last_update_time, self.sim_minutes)
+
+        # After all events processed, compute metrics with final active assignments.
+        # Assignment is a dataclass that always carries assignment_id and freq
+        # bounds, so no hasattr/getattr reflection filter is needed here.
+        real_assignments = self.spectrum_manager.active
         total_band_mhz = TOTAL_BANDWIDTH_MHZ
         total_area_km2 = self.environment.num_squares if hasattr(self.environment, 'num_squares') else 1
         sim_minutes = self.sim_minutes
@@ -174,16 +221,11 @@ class EventDrivenSimulation:
         return self.results
 
     def save_results(self, scenario_key, results_dir="results"):
-        import os, csv
+        import os
+        from utils.results_io import append_result_row
         if self.results is None:
             raise ValueError("No results to save. Run simulation first.")
         self.results["scenario"] = scenario_key
-        os.makedirs(results_dir, exist_ok=True)
         csv_path = os.path.join(results_dir, "simulation_results_event.csv")
-        file_exists = os.path.isfile(csv_path)
-        with open(csv_path, 'a', newline='') as csvfile:
-            fieldnames = list(self.results.keys())
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(self.results)
+        # Cached writer: the file is opened once per sweep, not once per row
+        append_result_row(csv_path, self.results)
@@ -1,11 +1,36 @@
 """
 Defines the MetricsCollector class for tracking spectrum utilization and management metrics.
 """
+import heapq
+from collections import defaultdict
+
+import numpy as np
+
+# Post-processing multiplier tables, allocated once at import instead of as
+# dict literals inside the multiplier methods
+_FREQ_MULT = {
+    'Large Blocks': 1,
+    'Sub Channels': 1.5,
+    'Freq Slicing': 2
+}
+_PRIORITY_MULT = {
+    'Exclusive': 1,
+    'Hierarchical': 1.5,
+    'Co-Primary': 2
+}
 
 class MetricsCollector:
     """
     Collects and calculates metrics for spectrum management simulation.
     """
+    # The collector is touched on every tick; slots make the counter
+    # loads/stores fixed-offset instead of __dict__ probes
+    __slots__ = ('mhz_km2_min_granted', 'coord_queries', 'human_minutes',
+                 'requests_total', 'requests_denied', 'quality_sum',
+                 'quality_count', 'daily_user_counts', 'active_day_sum',
+                 'avg_quality_sum', 'avg_quality_count', 'total_mhz_min_km2',
+                 'coordination_cost', '_policy_mult_cache')
+
     def __init__(self):
         # Initialize counters
         self.mhz_km2_min_granted = 0.0  # Traditional spectrum use metric (kept for backward compatibility)
@@ -23,6 +48,7 @@ class MetricsCollector:
         self.avg_quality_count = 0      # Count of average quality measurements
         self.total_mhz_min_km2 = 0.0    # Total MHz·km²·minutes
         self.coordination_cost = 0.0    # Total coordination cost (for dynamic/semi-dynamic renewals)
+        self._policy_mult_cache = None  # (arch_policy, combined multiplier) memo
     
     # Sensing multipliers for post-processing (configurable)
     SENSING_MULTIPLIERS = {
@@ -40,29 +66,28 @@ class MetricsCollector:
             environment: The Environment instance containing nodes
             tick_minutes: Number of minutes in this tick (default=1)
         """
-        # Update traditional metric (kept for backward compatibility)
-        for assignment in active_assignments:
-            # Calculate bandwidth of assignment
-            bandwidth = assignment.freq_end - assignment.freq_start
-            
-            # Get node and its coverage area (number of squares)
-            # This assumes each square is 1 km²
-            node = environment.nodes[assignment.node_id]
-            area_km2 = len(node.covered_squares)
-            
+        # Update traditional metric (kept for backward compatibility).
+        # Gather bandwidth·area and quality as arrays and reduce in C rather
+        # than accumulating per assignment in Python. The arrays are built
+        # fresh each call on purpose: mitigation mutates assignment.quality
+        # in place, so a cached mirror would silently go stale.
+        n = len(active_assignments)
+        if n:
+            # Each square is assumed to be 1 km² (area cached on the node,
+            # and the node itself cached on the assignment at grant time)
+            mhz_km2 = np.fromiter(
+                ((a.freq_end - a.freq_start) * a.node.area_km2
+                 for a in active_assignments),
+                dtype=np.float64, count=n)
+            qualities = np.fromiter((a.quality for a in active_assignments),
+                                    dtype=np.float64, count=n)
             # Accumulate MHz·km²·minutes (with quality factor)
-            self.mhz_km2_min_granted += bandwidth * area_km2 * tick_minutes * assignment.quality
-            self.total_mhz_min_km2 += bandwidth * area_km2 * tick_minutes
-        
-        # Only update daily user counts if tick_minutes is a multiple of 1440 (i.e., at day boundaries)
-        if tick_minutes % 1440 == 0:
-            current_day = tick_minutes // 1440 - 1
-            active_user_count = len(active_assignments)
-            self.daily_user_counts[current_day] = max(
-                self.daily_user_counts.get(current_day, 0), 
-                active_user_count
-            )
-            self.active_day_sum += active_user_count
+            self.mhz_km2_min_granted += float(mhz_km2 @ qualities) * tick_minutes
+            self.total_mhz_min_km2 += float(mhz_km2.sum()) * tick_minutes
+        # Daily user tracking lives in update_daily_users, called at day
+        # boundaries by the driver; the old tick_minutes % 1440 check here
+        # only ever fired for whole-day accrual intervals, where its
+        # tick_minutes-derived day index was meaningless anyway.
     
     def update_daily_users(self, day, active_assignments):
         """
@@ -99,46 +124,85 @@ class MetricsCollector:
         Returns:
             (num_interfering, interference_rate)
         """
-        # print("[DEBUG] mitigated_conflicts received in compute_interference:", mitigated_conflicts)
-        if mitigated_conflicts is None:
-            mitigated_conflicts = set()
-        interfering = set()
-        mode = getattr(arch_policy, 'coordination_mode', None)
-        # print(f"[DEBUG] Post-processing interference check: coordination_mode={mode}")
-        # print("[DEBUG] assignment IDs in compute_interference:", [getattr(a, 'assignment_id', None) for a in assignments])
-        # print("[DEBUG] Covered squares for each node:")
-        # for node in environment.nodes:
-        #     print(f"Node {node.node_id} covers squares: {sorted(node.covered_squares)}")
+        # Freeze once for the probe loop below
+        mitigated_conflicts = frozenset(mitigated_conflicts) if mitigated_conflicts else frozenset()
+        # Mark interfering assignments by position: a flat boolean scatter
+        # instead of hashing assignment IDs into a set per conflict
+        interfering = np.zeros(len(assignments), dtype=bool)
+        # Frequency-interval sweep with a spatial bucket join instead of the
+        # old O(N^2) pairwise scan: walk assignments in freq_start order,
+        # retire ones whose band has closed, and only pair against live
+        # assignments sharing a covered square. Any assignment still live
+        # when a later one opens is guaranteed to overlap it in frequency,
+        # so the per-pair band test disappears entirely.
+        # Frequency gates spatial work by construction: pairs reach the
+        # square join only while both bands are open, so no coverage test
+        # ever runs for frequency-disjoint assignments.
+        # Flatten the per-assignment fields the sweep touches into parallel
+        # lists up front, so the loop works on plain locals instead of
+        # chasing assignment -> node attribute chains per iteration
+        freq_starts = [a.freq_start for a in assignments]
+        freq_ends = [a.freq_end for a in assignments]
+        ids = [a.assignment_id for a in assignments]
+        squares_by_idx = [a.node.covered_squares for a in assignments]
 
-        # print("[DEBUG] Final assignments (pre-interference check):")
-        # for a in assignments:
-        #     covered = sorted(environment.nodes[a.node_id].covered_squares)
-        #     print(f"Assignment {a.assignment_id}: node={a.node_id}, freq=({a.freq_start}-{a.freq_end}), device={a.device_type}, covered_squares={covered}")
-        # Extra: Check for true conflicts and print summary
-        found_conflict = False
-        for i, a1 in enumerate(assignments):
-            for j in range(i+1, len(assignments)):
-                a2 = assignments[j]
-                same_freq = not (a1.freq_end <= a2.freq_start or a2.freq_end <= a1.freq_start)
-                overlap_squares = environment.nodes[a1.node_id].covered_squares.intersection(environment.nodes[a2.node_id].covered_squares)
-                if same_freq and overlap_squares:
-                    pair = tuple(sorted((a1.assignment_id, a2.assignment_id)))
+        order = sorted(range(len(assignments)), key=freq_starts.__getitem__)
+        live_heap = []  # (freq_end, idx) of assignments whose band is still open
+        live_by_square = defaultdict(set)
+        for i in order:
+            freq_start = freq_starts[i]
+            freq_end = freq_ends[i]
+            id1 = ids[i]
+            while live_heap and live_heap[0][0] <= freq_start:
+                _, j = heapq.heappop(live_heap)
+                for square in squares_by_idx[j]:
+                    live_by_square[square].discard(j)
+            squares = squares_by_idx[i]
+            seen = set()
+            for square in squares:
+                for j in live_by_square[square]:
+                    if j in seen:
+                        continue
+                    seen.add(j)
+                    if freq_starts[j] >= freq_end:
+                        # Degenerate zero-width band opening exactly where a
+                        # live assignment starts: no true frequency overlap
+                        continue
+                    id2 = ids[j]
+                    # Same packed-int pair encoding the SpectrumManager
+                    # writes into mitigated_conflicts
+                    pair = (id1 << 32) | id2 if id1 < id2 else (id2 << 32) | id1
                     if pair in mitigated_conflicts:
                         continue  # This conflict was mitigated, skip
-                    # print(f"[SUMMARY CONFLICT] Assignments {a1.assignment_id} and {a2.assignment_id} overlap in freq and squares: freq=({a1.freq_start}-{a1.freq_end}) & ({a2.freq_start}-{a2.freq_end}), squares={sorted(overlap_squares)}")
-                    found_conflict = True
                     # Only count as interfering if not mitigated
-                    interfering.add(a1.assignment_id)
-                    interfering.add(a2.assignment_id)
-        if not found_conflict:
-            # print("[SUMMARY] No true freq+squares conflicts in final assignments.")
-            pass
+                    interfering[i] = True
+                    interfering[j] = True
+            heapq.heappush(live_heap, (freq_end, i))
+            for square in squares:
+                live_by_square[square].add(i)
 
-        # print("[DEBUG] Checking for assignment conflicts:")
-        num_interfering = len(interfering)
+        num_interfering = int(interfering.sum())
         interference_rate = num_interfering / max(1, len(assignments))
         return num_interfering, interference_rate
 
+    def _policy_multiplier(self, arch_policy):
+        """
+        Combined freq_plan x enforcement x priority x sensing multiplier for
+        the given policy. The policy is immutable per simulation, so the
+        product is computed once and memoized on the collector; both metric
+        post-processors share it instead of duplicating the tables.
+        """
+        cached = self._policy_mult_cache
+        if cached is not None and cached[0] is arch_policy:
+            return cached[1]
+        freq_mult = _FREQ_MULT.get(getattr(arch_policy, 'freq_plan', None), 1)
+        enforcement_mult = 2 if getattr(arch_policy, 'enforcement_mode', None) == 'Active' else 1
+        priority_mult = _PRIORITY_MULT.get(getattr(arch_policy, 'priority_mode', None), 1)
+        sensing_mult = self.SENSING_MULTIPLIERS.get(getattr(arch_policy, 'sensing_mode', None), 1.0)
+        multiplier = freq_mult * enforcement_mult * priority_mult * sensing_mult
+        self._policy_mult_cache = (arch_policy, multiplier)
+        return multiplier
+
     def apply_query_multipliers(self, coord_queries, arch_policy):
         """
         Apply post-processing multipliers to the coord_queries metric based on freq_plan, enforcement_mode, priority_mode, and sensing_mode,
@@ -148,19 +212,7 @@ class MetricsCollector:
         licensing_mode = getattr(arch_policy, 'licensing_mode', None)
         if licensing_mode not in ['Dynamic', 'Semi-Dynamic']:
             return coord_queries
-        freq_mult = {
-            'Large Blocks': 1,
-            'Sub Channels': 1.5,
-            'Freq Slicing': 2
-        }.get(getattr(arch_policy, 'freq_plan', None), 1)
-        enforcement_mult = 2 if getattr(arch_policy, 'enforcement_mode', None) == 'Active' else 1
-        priority_mult = {
-            'Exclusive': 1,
-            'Hierarchical': 1.5,
-            'Co-Primary': 2
-        }.get(getattr(arch_policy, 'priority_mode', None), 1)
-        sensing_mult = self.SENSING_MULTIPLIERS.get(getattr(arch_policy, 'sensing_mode', None), 1.0)
-        return coord_queries * freq_mult * enforcement_mult * priority_mult * sensing_mult
+        return coord_queries * self._policy_multiplier(arch_policy)
 
     def apply_human_minutes_multipliers(self, human_minutes, arch_policy):
         """
@@ -170,19 +222,7 @@ class MetricsCollector:
         """
         if getattr(arch_policy, 'licensing_mode', None) != 'Manual':
             return human_minutes
-        freq_mult = {
-            'Large Blocks': 1,
-            'Sub Channels': 1.5,
-            'Freq Slicing': 2
-        }.get(getattr(arch_policy, 'freq_plan', None), 1)
-        enforcement_mult = 2 if getattr(arch_policy, 'enforcement_mode', None) == 'Active' else 1
-        priority_mult = {
-            'Exclusive': 1,
-            'Hierarchical': 1.5,
-            'Co-Primary': 2
-        }.get(getattr(arch_policy, 'priority_mode', None), 1)
-        sensing_mult = self.SENSING_MULTIPLIERS.get(getattr(arch_policy, 'sensing_mode', None), 1.0)
-        return human_minutes * freq_mult * enforcement_mult * priority_mult * sensing_mult
+        return human_minutes * self._policy_multiplier(arch_policy)
 
     def final_report(self, total_band_mhz, total_area_km2, sim_minutes, final_active_assignments, environment, arch_policy, mitigated_conflicts=None):
         """
@@ -206,7 +246,9 @@ class MetricsCollector:
         # B = total available bandwidth (600 MHz for 37 GHz band)
         # S = area size in km^2 (number of squares)
         # T = simulation time in days
-        M = len(final_active_assignments) if final_active_assignments is not None else 0
+        # Size the final population once; every consumer below reuses it
+        n_final = len(final_active_assignments) if final_active_assignments is not None else 0
+        M = n_final
         B = 600  # MHz, fixed for 37 GHz band
         S = environment.num_squares if hasattr(environment, 'num_squares') else 1
         T = sim_minutes / (60 * 24)  # convert minutes to days
@@ -215,12 +257,16 @@ class MetricsCollector:
         # Keep previous SUEs for reference
         traditional_sue = self.mhz_km2_min_granted / max(1, total_band_mhz * total_area_km2 * sim_minutes)
         correct_sue = self.total_mhz_min_km2 / max(1, total_band_mhz * total_area_km2 * sim_minutes)
-        # Compute mean quality based on final active assignments, not just initial assignment time
-        if final_active_assignments is not None and len(final_active_assignments) > 0:
-            mean_quality = sum(a.quality for a in final_active_assignments) / max(1, len(final_active_assignments))
+        # Compute mean quality based on final active assignments, not just
+        # initial assignment time. Reduced as a typed array so the mean runs
+        # in C rather than through the generator protocol per element.
+        if n_final > 0:
+            qualities = np.fromiter((a.quality for a in final_active_assignments),
+                                    dtype=np.float64, count=n_final)
+            mean_quality = float(qualities.mean())
         else:
             mean_quality = self.quality_sum / max(1, self.quality_count)
-        total_active_users = len(final_active_assignments) if final_active_assignments is not None else 0
+        total_active_users = n_final
         num_interfering, interference_rate = self.compute_interference(
             final_active_assignments, environment, arch_policy, mitigated_conflicts=mitigated_conflicts)
         interference_metrics = {
@@ -2,10 +2,11 @@
 Core simulation module for spectrum management.
 """
 import os
-import csv
 from core.metrics import MetricsCollector
 from core.spectrum_manager import SpectrumManager
 from config.scenarios import DEFAULT_SIM_MINUTES
+from config.parameters import TRACE_ENABLED
+from utils.results_io import append_result_row
 
 class Simulation:
     """
@@ -40,33 +41,38 @@ class Simulation:
         Returns:
             Dictionary with simulation results
         """
-        # Create cursor to track position in demand list
-        cursor = 0
-        demand_length = len(self.demand_list)
-        
+        # Bucket requests by arrival tick in one pass over the demand list
+        # (which may arrive shuffled from the generator); the tick loop then
+        # does a single O(1) index per minute with no cursor arithmetic.
+        # Buckets stay None until used so quiet ticks allocate nothing.
+        arrivals_by_tick = [None] * self.sim_minutes
+        for req in self.demand_list:
+            arrival_time = req.arrival_time
+            if arrival_time < self.sim_minutes:
+                bucket = arrivals_by_tick[arrival_time]
+                if bucket is None:
+                    arrivals_by_tick[arrival_time] = bucket = []
+                bucket.append(req)
+
         # Main simulation loop
         for tick in range(self.sim_minutes):
-            # Process arrivals for this tick
-            arrivals = []
-            while cursor < demand_length and self.demand_list[cursor].arrival_time == tick:
-                arrivals.append(self.demand_list[cursor])
-                cursor += 1
-            
-            # Handle arrivals based on licensing mode
-            self.spectrum_manager.process_arrivals(arrivals, tick)
+            arrivals = arrivals_by_tick[tick]
+            if arrivals is not None:
+                # Handle arrivals based on licensing mode
+                self.spectrum_manager.process_arrivals(arrivals, tick)
             self.spectrum_manager.tick_housekeeping(tick)
         
-        # Gather final assignments
-        final_active_assignments = []
-        for node in self.environment.nodes:
-            final_active_assignments.extend(node.active_assignments)
+        # The spectrum manager already maintains the live list of active
+        # assignments incrementally (append on grant, remove on revocation),
+        # so there is nothing to rebuild from the per-node lists here
+        final_active_assignments = self.spectrum_manager.active
 
-        # DEBUG: Print mitigated_conflicts before metrics
         mitigated_conflicts = getattr(self.spectrum_manager, 'mitigated_conflicts', None)
-        print("[DEBUG] mitigated_conflicts at end:", mitigated_conflicts)
-        print("[DEBUG] Final assignments (assignment_id, node_id, freq_start, freq_end):")
-        for a in final_active_assignments:
-            print(f"  id={a.assignment_id}, node={a.node_id}, freq=({a.freq_start}-{a.freq_end})")
+        if TRACE_ENABLED:
+            print("[DEBUG] mitigated_conflicts at end:", mitigated_conflicts)
+            print("[DEBUG] Final assignments (assignment_id, node_id, freq_start, freq_end):")
+            for a in final_active_assignments:
+                print(f"  id={a.assignment_id}, node={a.node_id}, freq=({a.freq_start}-{a.freq_end})")
 
         # Call metrics report with mitigated_conflicts
         self.results = self.metrics.final_report(
@@ -102,24 +108,12 @@ class Simulation:
         """
         if self.results is None:
             raise ValueError("No results to save. Run simulation first.")
-        
+
         # Add scenario key to results
         self.results["scenario"] = scenario_key
-        
-        # Ensure results directory exists
-        os.makedirs(results_dir, exist_ok=True)
-        
+
         # Determine CSV file path
         csv_path = os.path.join(results_dir, "simulation_results.csv")
-        file_exists = os.path.isfile(csv_path)
-        
-        # Write results
-        with open(csv_path, 'a', newline='') as csvfile:
-            fieldnames = list(self.results.keys())
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            # Write header if file is new
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(self.results)
+
+        # Cached writer: one open/header per sweep instead of per scenario
+        append_result_row(csv_path, self.results)
@@ -1,10 +1,12 @@
 """
 Spectrum Manager module for frequency assignments.
 """
-from models.assignment import Assignment
-from config.parameters import FREQ_BASE_MHZ, TOTAL_BANDWIDTH_MHZ
+from models.assignment import Assignment, MITIGATION_QUALITY_ROWS
+from config.parameters import FREQ_BASE_MHZ, TOTAL_BANDWIDTH_MHZ, TRACE_ENABLED
 from collections import defaultdict
+import heapq
 import random
+import numpy as np
 
 class SpectrumManager:
     """
@@ -22,12 +24,50 @@ class SpectrumManager:
         self.environment = environment
         self.arch_policy = architecture_policy
         self.metrics = metrics_collector
-        # Use lists for assignment management
+        # self.active stays an insertion-ordered list: tests and reports
+        # index it, and grants only ever append. Membership is tracked in a
+        # parallel id set so removal no longer scans the list twice.
         self.active = []  # List of all active assignments
-        self.square_to_assignments = defaultdict(list)  # Each square: list of assignments
+        self._active_ids = set()  # O(1) membership check for removals
+        self.n_active = 0  # Kept in sync with len(self.active); cheap to read per event
+        # Share the live list with the environment so holders of only the
+        # environment see grants/revocations without any per-node gather
+        self.environment.active_assignments = self.active
+        # Each square: {assignment_id: Assignment}. Keyed dicts give O(1)
+        # add/remove while keeping insertion order deterministic, which an
+        # identity-hashed set of assignments would not
+        self.square_to_assignments = defaultdict(dict)
+        # Bloom-style occupancy filter: per square, one bit per 10 MHz
+        # bucket of the band, OR-ed over the live assignments there (same
+        # int-bitmask idiom as Node.covered_mask). A zero AND against a
+        # candidate's bucket mask proves no conflict is possible, letting
+        # the candidate loop skip the gather and geometry checks. Bucket
+        # reference counts back the mask so removals can clear bits that
+        # mitigated coexistence left shared.
+        self._square_freq_mask = defaultdict(int)
+        self._square_freq_count = defaultdict(lambda: defaultdict(int))
         self.next_assignment_id = 0
         self.manual_queue = []  # Queue for manual licensing mode
+        # Min-heap of (next_check_tick, assignment_id, assignment) so renewal
+        # only touches assignments actually due instead of scanning every
+        # active assignment each tick. Entries go stale when an assignment is
+        # rescheduled or revoked; they are validated lazily on pop.
+        self._renewal_heap = []
         self.mitigated_conflicts = set()
+        # Candidate frequencies depend only on (device_type, requested_bw)
+        # for a fixed policy, so templates are built once and reshuffled
+        # per request instead of regenerated
+        self._candidate_cache = {}
+        # Topology is static, so each node's {itself + neighbors} id set is
+        # resolved through get_neighbors once and reused (filled lazily:
+        # callers may swap nodes/neighbor logic before the first request)
+        self._neighbor_ids_cache = {}
+        # Scratch containers reused across candidates: clear() keeps the
+        # backing storage allocated, so the gather loops stop hitting the
+        # allocator once warmed up
+        self._scratch_merged = {}
+        self._scratch_conflicts = []
+        self._scratch_seen = set()
         
         # Derive constants from architecture policy
         # Channel step based on frequency plan
@@ -38,6 +78,11 @@ class SpectrumManager:
         else:  # "Freq Slicing"
             self.channel_step_mhz = 10
             
+        # The policy is fixed for the manager's lifetime; resolve the
+        # licensing-mode comparisons once so per-tick paths branch on booleans
+        self._manual_mode = self.arch_policy.licensing_mode == "Manual"
+        self._dynamic_mode = self.arch_policy.licensing_mode == "Dynamic"
+
         # Query interval based on licensing mode
         if self.arch_policy.licensing_mode == "Manual":
             self.query_interval = float('inf')  # Permanent assignments
@@ -57,6 +102,16 @@ class SpectrumManager:
             self.initial_query_cost = 0.75
             self.renewal_query_cost = 0.5
             
+        # Priority tiers are fixed per policy: resolve them to a dict once
+        # instead of string-comparing the device type on every candidate
+        if self.arch_policy.priority_mode == "Hierarchical":
+            self._tier_map = {"Federal": 0, "5G": 1, "IoT": 2}
+            self._default_tier = 2
+        else:
+            # In Co-Primary or Exclusive, all have same tier
+            self._tier_map = {"Federal": 0, "5G": 0, "IoT": 0}
+            self._default_tier = 0
+
         # For Exclusive mode, define fixed band partitions
         self.band_partitions = {}
         if self.arch_policy.priority_mode == "Exclusive":
@@ -70,17 +125,51 @@ class SpectrumManager:
     
     def _add_assignment(self, assignment):
         self.active.append(assignment)
+        self._active_ids.add(assignment.assignment_id)
+        self.n_active += 1
+        if assignment.next_check_tick is not None:
+            heapq.heappush(self._renewal_heap,
+                           (assignment.next_check_tick, assignment.assignment_id, assignment))
+        # Cache the node on the assignment so hot loops (usage metrics,
+        # interference sweep, renewals) skip the nodes[node_id] lookup
         node = self.environment.nodes[assignment.node_id]
+        assignment.node = node
+        lo, hi, band_mask = self._freq_bucket_mask(assignment.freq_start, assignment.freq_end)
         for square in node.covered_squares:
-            self.square_to_assignments[square].append(assignment)
+            self.square_to_assignments[square][assignment.assignment_id] = assignment
+            counts = self._square_freq_count[square]
+            for bucket in range(lo, hi + 1):
+                counts[bucket] += 1
+            self._square_freq_mask[square] |= band_mask
 
     def _remove_assignment(self, assignment):
-        if assignment in self.active:
-            self.active.remove(assignment)
-        node = self.environment.nodes[assignment.node_id]
-        for square in node.covered_squares:
-            if assignment in self.square_to_assignments[square]:
-                self.square_to_assignments[square].remove(assignment)
+        # Guarded by the id set so a second call for the same assignment is
+        # a no-op: the bucket refcounts and occupancy masks are shared with
+        # still-live assignments and must be decremented exactly once
+        if assignment.assignment_id not in self._active_ids:
+            return
+        self._active_ids.remove(assignment.assignment_id)
+        self.active.remove(assignment)
+        self.n_active -= 1
+        # Tombstone any renewal-heap entry: no further checks are due
+        assignment.next_check_tick = None
+        lo, hi, _ = self._freq_bucket_mask(assignment.freq_start, assignment.freq_end)
+        for square in assignment.node.covered_squares:
+            self.square_to_assignments[square].pop(assignment.assignment_id, None)
+            counts = self._square_freq_count[square]
+            for bucket in range(lo, hi + 1):
+                counts[bucket] -= 1
+                if counts[bucket] <= 0:
+                    del counts[bucket]
+                    self._square_freq_mask[square] &= ~(1 << bucket)
+
+    @staticmethod
+    def _freq_bucket_mask(freq_start, freq_end):
+        """Map a [freq_start, freq_end) band to its 10 MHz bucket range and
+        the int bitmask covering those buckets."""
+        lo = (freq_start - FREQ_BASE_MHZ) // 10
+        hi = (freq_end - 1 - FREQ_BASE_MHZ) // 10
+        return lo, hi, ((1 << (hi - lo + 1)) - 1) << lo
         
     def process_arrivals(self, requests, current_tick):
         """
@@ -90,11 +179,37 @@ class SpectrumManager:
             requests: List of SpectrumRequest objects
             current_tick: Current simulation tick
         """
-        mode = self.arch_policy.coordination_mode
+        # The tick loop calls this every minute, usually with no arrivals
+        if not requests:
+            return
+        arch_policy = self.arch_policy
+        mode = arch_policy.coordination_mode
         hybrid_toggle = getattr(self, '_hybrid_toggle', 0)
+        # Hoist per-request lookups to locals for the hot gather loops below
+        environment = self.environment
+        nodes = environment.nodes
+        square_to_assignments = self.square_to_assignments
+        active = self.active
+        priority_mode = arch_policy.priority_mode
+        freq_plan = arch_policy.freq_plan
+        interference_mitigation = arch_policy.interference_mitigation
+        # Resolve the per-call-invariant string comparisons to booleans once
+        exclusive = priority_mode == "Exclusive"
+        hierarchical = priority_mode == "Hierarchical"
+        mitigate_enabled = interference_mitigation != "No Mitigation"
+        # Quality-factor row (indexed by relationship code) for the batch
+        # mitigation path; None when the option never mitigates
+        mitigation_row = MITIGATION_QUALITY_ROWS.get(interference_mitigation)
+        get_priority_tier = self._get_priority_tier
+        square_freq_mask = self._square_freq_mask
+        freq_bucket_mask = self._freq_bucket_mask
         for request in requests:
-            request.add_trace(f"Arrived at time {request.arrival_time}: node={request.node_id}, requested_bw={request.requested_bw} MHz, device_type={request.device_type}")
+            if TRACE_ENABLED:
+                request.add_trace(f"Arrived at time {request.arrival_time}: node={request.node_id}, requested_bw={request.requested_bw} MHz, device_type={request.device_type}")
             candidates = self._generate_frequency_candidates(request)
+            # The tier and requesting node are per-request, not per-candidate
+            tier = get_priority_tier(request.device_type)
+            node = nodes[request.node_id]
             assignment_made = False
             # --- Hybrid: alternate between centralized and decentralized for each request ---
             if mode == "Hybrid":
@@ -103,156 +218,252 @@ class SpectrumManager:
             else:
                 use_centralized = (mode == "Centralized")
             self._hybrid_toggle = hybrid_toggle if mode == "Hybrid" else 0
-            for freq_start, freq_end in candidates:
+            # Exclusive-mode occupancy aggregates are invariant across the
+            # candidate loop (nothing is granted until we break), so compute
+            # them once per request instead of per candidate
+            partition_occupied = False
+            band_exhausted = False
+            if exclusive:
+                if freq_plan == "Large Blocks":
+                    partition_occupied = any(a.device_type == request.device_type for a in active)
+                elif freq_plan == "Sub Channels":
+                    assigned_bw = sum(a.freq_end - a.freq_start for a in active)
+                    band_exhausted = assigned_bw >= TOTAL_BANDWIDTH_MHZ
+            # Lazy Fisher-Yates: draw the i-th random candidate only when
+            # the loop actually reaches it. Grants usually break after a
+            # few candidates, so most of the old up-front shuffle was
+            # wasted work.
+            n_candidates = len(candidates)
+            for cand_idx in range(n_candidates):
+                swap_idx = random.randint(cand_idx, n_candidates - 1)
+                if swap_idx != cand_idx:
+                    candidates[cand_idx], candidates[swap_idx] = candidates[swap_idx], candidates[cand_idx]
+                freq_start, freq_end = candidates[cand_idx]
                 # === ENFORCE EXCLUSIVITY BASED ON FREQ PLAN ===
-                if self.arch_policy.priority_mode == "Exclusive":
-                    if self.arch_policy.freq_plan == "Large Blocks":
+                if exclusive:
+                    if freq_plan == "Large Blocks":
                         # Only one assignment per device type partition, globally
-                        if any(a.device_type == request.device_type for a in self.active):
+                        if partition_occupied:
                             continue  # Partition already occupied
-                    elif self.arch_policy.freq_plan == "Sub Channels":
+                    elif freq_plan == "Sub Channels":
                         # Once all sub-channels (600 MHz) are assigned, block further assignments
-                        assigned_bw = sum(a.freq_end - a.freq_start for a in self.active)
-                        if assigned_bw >= TOTAL_BANDWIDTH_MHZ:
+                        if band_exhausted:
                             continue  # All spectrum occupied
-                    elif self.arch_policy.freq_plan == "Freq Slicing":
+                    elif freq_plan == "Freq Slicing":
                         # No overlap anywhere in the environment
                         overlap = False
-                        for a in self.active:
+                        for a in active:
                             if not (freq_end <= a.freq_start or freq_start >= a.freq_end):
                                 overlap = True
                                 break
                         if overlap:
                             continue  # Requested slice is already occupied
-                # --- ENFORCE EXCLUSIVE MODE PARTITIONING ---
-                if self.arch_policy.freq_plan == "Large Blocks":
-                    block_size = 200
-                    freq_end = freq_start + block_size  # Always assign 200 MHz
-                if self.arch_policy.priority_mode == "Exclusive":
-                    part = self.band_partitions.get(request.device_type)
-                    if part is not None:
-                        if not (part[0] <= freq_start and freq_end <= part[1]):
-                            continue  # Skip candidates outside partition
+                # Candidates already honor Exclusive-mode partitioning (and
+                # the 200 MHz Large Blocks width) by construction in
+                # _generate_frequency_candidates, so no per-candidate
+                # partition re-check is needed here
                 temp_assignment = Assignment(
                     assignment_id=self.next_assignment_id,
                     node_id=request.node_id,
                     freq_start=freq_start,
                     freq_end=freq_end,
                     device_type=request.device_type,
-                    priority_tier=self._get_priority_tier(request.device_type)
+                    priority_tier=tier,
+                    node=node
                 )
-                node = self.environment.nodes[temp_assignment.node_id]
-                possible_conflicts = []
-                if use_centralized:
-                    # Global: check all covered squares for all nodes
-                    if isinstance(self.environment.nodes, dict):
-                        nodes_iter = self.environment.nodes.values()
-                    else:
-                        nodes_iter = self.environment.nodes
-                    for n in nodes_iter:
-                        for square in n.covered_squares:
-                            possible_conflicts.extend(self.square_to_assignments[square])
+                # Bloom-style fast reject: a zero AND between the
+                # candidate's bucket mask and every covered square's
+                # occupancy mask proves nothing can conflict, so the
+                # gather and geometry checks are skipped outright
+                _, _, cand_mask = freq_bucket_mask(freq_start, freq_end)
+                may_conflict = False
+                for square in node.covered_squares:
+                    if square_freq_mask[square] & cand_mask:
+                        may_conflict = True
+                        break
+                if not may_conflict:
+                    possible_conflicts = ()
+                elif use_centralized:
+                    # Although the coordinator sees every assignment, only
+                    # those sharing a covered square with the requesting
+                    # node can conflict (conflicts_with rejects the rest),
+                    # so merge just that node's bucket dicts — gathering
+                    # and deduplicating in one pass
+                    merged = self._scratch_merged
+                    merged.clear()
+                    for square in node.covered_squares:
+                        merged.update(square_to_assignments[square])
+                    possible_conflicts = merged.values()
                 else:
                     # --- Decentralized with 50% ignorance ---
-                    neighbor_ids = set([request.node_id])
-                    if hasattr(self.environment, 'get_neighbors'):
-                        neighbor_ids.update(self.environment.get_neighbors(request.node_id))
-                    possible_conflicts = []
-                    seen_assignments = set()
+                    neighbor_ids = self._neighbor_ids_cache.get(request.node_id)
+                    if neighbor_ids is None:
+                        neighbor_ids = {request.node_id}
+                        if hasattr(environment, 'get_neighbors'):
+                            neighbor_ids.update(environment.get_neighbors(request.node_id))
+                        self._neighbor_ids_cache[request.node_id] = neighbor_ids
+                    possible_conflicts = self._scratch_conflicts
+                    possible_conflicts.clear()
+                    seen_assignments = self._scratch_seen
+                    seen_assignments.clear()
                     for n_id in neighbor_ids:
-                        n = self.environment.nodes[n_id]
+                        n = nodes[n_id]
                         for square in n.covered_squares:
                             # Only include assignments that were made by this neighbor (not all assignments in the square)
-                            for assignment in self.square_to_assignments[square]:
+                            for assignment in square_to_assignments[square].values():
                                 if assignment.node_id == n_id and id(assignment) not in seen_assignments:
                                     # 50% chance to ignore this neighbor's assignment
                                     if n_id != request.node_id and random.random() < 0.5:
                                         continue
                                     possible_conflicts.append(assignment)
                                     seen_assignments.add(id(assignment))
-                # Deduplicate by id to avoid redundant checks
-                seen = set()
+                # Both gather paths above already deduplicate. Candidate
+                # geometry is fixed, so run the conflicts_with predicate
+                # once per candidate pair up front; the loop below and the
+                # post-preemption re-checks then work on the surviving
+                # list instead of re-running geometry per iteration.
+                n_pool = len(possible_conflicts)
+                if n_pool > 32:
+                    # Large pools: one vectorized sweep of the full
+                    # predicate (band overlap and spatial overlap) via the
+                    # environment's batch helper
+                    pool = list(possible_conflicts)
+                    conflict_idx = environment.find_conflicts(
+                        freq_start, freq_end, request.node_id, pool)
+                    actual_conflicts = [pool[i] for i in conflict_idx.tolist()]
+                else:
+                    actual_conflicts = [a for a in possible_conflicts
+                                        if temp_assignment.conflicts_with(a, environment)]
                 conflict = False
                 preempted_assignment = None
-                for assignment in possible_conflicts:
-                    if id(assignment) in seen:
-                        continue
-                    seen.add(id(assignment))
-                    if temp_assignment.conflicts_with(assignment, self.environment):
-                        # --- HIERARCHICAL PRIORITY ENFORCEMENT ---
-                        if self.arch_policy.priority_mode == "Hierarchical":
-                            temp_priority = temp_assignment.priority_tier
-                            other_priority = assignment.priority_tier
-                            if temp_priority < other_priority:
-                                # Preempt the lower-priority assignment
-                                self._remove_assignment(assignment)  # Remove immediately
-                                request.add_trace(f"Preempted assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) due to higher priority.")
-                                # After preemption, double-check for new conflicts with remaining assignments
-                                # Rebuild possible_conflicts without the preempted assignment
-                                possible_conflicts_updated = [a for a in possible_conflicts if a != assignment]
-                                # Re-check for conflicts
-                                still_conflict = False
-                                for other in possible_conflicts_updated:
-                                    if temp_assignment.conflicts_with(other, self.environment):
-                                        still_conflict = True
-                                        conflict = True
-                                        request.add_trace(f"Conflict remains after preemption with assignment {other.assignment_id} (node={other.node_id}, freq={other.freq_start}-{other.freq_end}).")
-                                        break
-                                if still_conflict:
-                                    break  # Cannot assign due to remaining conflict
-                                else:
-                                    continue  # No more conflicts, continue to assignment
-                            elif temp_priority > other_priority:
-                                conflict = True
-                                request.add_trace(f"Conflict with higher-priority assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) not mitigated.")
-                                break
-                            # If equal priority, fall through to mitigation
-                        mitigation_attempted = False
-                        if self.arch_policy.interference_mitigation != "No Mitigation":
-                            mitigation_attempted = temp_assignment.apply_mitigation(assignment, self.arch_policy, self.environment)
-                        if mitigation_attempted:
-                            self.mitigated_conflicts.add(tuple(sorted((temp_assignment.assignment_id, assignment.assignment_id))))
-                            request.add_trace(f"Conflict with assignment {assignment.assignment_id} mitigated.")
+                # --- HIERARCHICAL PRIORITY ENFORCEMENT ---
+                # Order-insensitive: the candidate's fate is decided from
+                # the whole conflict set before anything is revoked, so the
+                # outcome no longer depends on gather order and a failed
+                # candidate leaves no revocations behind. Preemption only
+                # happens in the grant block below, once success is known.
+                if hierarchical and actual_conflicts:
+                    temp_priority = temp_assignment.priority_tier
+                    outranked = None
+                    lower_tier = None
+                    for blocker in actual_conflicts:
+                        other_priority = blocker.priority_tier
+                        if other_priority < temp_priority:
+                            outranked = blocker
+                            break
+                        if other_priority > temp_priority:
+                            lower_tier = blocker
+                    if outranked is not None:
+                        conflict = True
+                        if TRACE_ENABLED:
+                            request.add_trace(f"Conflict with higher-priority assignment {outranked.assignment_id} (node={outranked.node_id}, freq={outranked.freq_start}-{outranked.freq_end}) not mitigated.")
+                    elif lower_tier is not None:
+                        if len(actual_conflicts) == 1:
+                            # Sole conflict and we outrank it: revoke on grant
+                            preempted_assignment = lower_tier
+                            if TRACE_ENABLED:
+                                request.add_trace(f"Preempted assignment {lower_tier.assignment_id} (node={lower_tier.node_id}, freq={lower_tier.freq_start}-{lower_tier.freq_end}) due to higher priority.")
                         else:
-                            # If mitigation is not attempted or fails, resolve by priority (for non-hierarchical modes, treat as equal priority)
-                            temp_priority = temp_assignment.priority_tier
-                            other_priority = assignment.priority_tier
-                            if temp_priority < other_priority:
-                                self._remove_assignment(assignment)
-                                request.add_trace(f"Preempted assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) due to higher priority.")
-                                possible_conflicts_updated = [a for a in possible_conflicts if a != assignment]
-                                still_conflict = False
-                                for other in possible_conflicts_updated:
-                                    if temp_assignment.conflicts_with(other, self.environment):
-                                        still_conflict = True
-                                        conflict = True
-                                        request.add_trace(f"Conflict remains after preemption with assignment {other.assignment_id} (node={other.node_id}, freq={other.freq_start}-{other.freq_end}).")
-                                        break
-                                if still_conflict:
-                                    break
-                                else:
-                                    continue
-                            elif temp_priority > other_priority:
+                            conflict = True
+                            if TRACE_ENABLED:
+                                other = next(a for a in actual_conflicts if a is not lower_tier)
+                                request.add_trace(f"Conflict with assignment {lower_tier.assignment_id} not preempted: conflict with assignment {other.assignment_id} (node={other.node_id}, freq={other.freq_start}-{other.freq_end}) remains.")
+                    # else: all conflicts share the tier - resolved by
+                    # mitigation below, like the non-hierarchical modes
+                # Batch mitigation for large conflict sets (non-hierarchical
+                # only: hierarchical compares priorities before mitigating).
+                # Gather the relationship codes of all pairs at once, map
+                # them through the quality row, and apply the factors up to
+                # the first unmitigable pair - exactly the prefix the scalar
+                # loop would have mitigated before failing. The scalar loop
+                # then resumes from that pair for priority resolution.
+                batch_start = 0
+                if (mitigation_row is not None and not hierarchical
+                        and len(actual_conflicts) > 8):
+                    other_node_ids = np.fromiter(
+                        (a.node_id for a in actual_conflicts), np.intp,
+                        len(actual_conflicts))
+                    factors = mitigation_row[environment.pair_relationships(
+                        request.node_id, other_node_ids)]
+                    unmitigable = np.isnan(factors)
+                    n_ok = (int(unmitigable.argmax()) if unmitigable.any()
+                            else len(actual_conflicts))
+                    factor_list = factors.tolist()
+                    id1 = temp_assignment.assignment_id
+                    record_mitigated = self.mitigated_conflicts.add
+                    for i in range(n_ok):
+                        other = actual_conflicts[i]
+                        quality_factor = factor_list[i]
+                        temp_assignment.quality *= quality_factor
+                        other.quality *= quality_factor
+                        id2 = other.assignment_id
+                        record_mitigated(
+                            (id1 << 32) | id2 if id1 < id2 else (id2 << 32) | id1)
+                        if TRACE_ENABLED:
+                            request.add_trace(f"Conflict with assignment {id2} mitigated.")
+                    batch_start = n_ok
+                # The loop below only resolves by mitigation: hierarchical
+                # candidates reach it solely in the all-equal-tier case
+                if conflict or preempted_assignment is not None:
+                    scalar_conflicts = ()
+                elif batch_start == 0:
+                    scalar_conflicts = actual_conflicts
+                else:
+                    scalar_conflicts = actual_conflicts[batch_start:]
+                for assignment in scalar_conflicts:
+                    mitigation_attempted = False
+                    if mitigate_enabled:
+                        mitigation_attempted = temp_assignment.apply_mitigation(assignment, arch_policy, environment)
+                    if mitigation_attempted:
+                        id1 = temp_assignment.assignment_id
+                        id2 = assignment.assignment_id
+                        # Pack the canonical pair into one int: ints
+                        # hash faster and store smaller than tuples
+                        self.mitigated_conflicts.add(
+                            (id1 << 32) | id2 if id1 < id2 else (id2 << 32) | id1)
+                        if TRACE_ENABLED:
+                            request.add_trace(f"Conflict with assignment {assignment.assignment_id} mitigated.")
+                    else:
+                        # If mitigation is not attempted or fails, resolve by priority (for non-hierarchical modes, treat as equal priority)
+                        temp_priority = temp_assignment.priority_tier
+                        other_priority = assignment.priority_tier
+                        if temp_priority < other_priority:
+                            # Removal cannot change the others' geometry, so
+                            # any other member of actual_conflicts would
+                            # still conflict; check that before revoking so
+                            # a failed candidate preempts nothing
+                            remaining = [a for a in actual_conflicts if a is not assignment]
+                            if remaining:
                                 conflict = True
-                                request.add_trace(f"Conflict with higher-priority assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) not mitigated.")
+                                if TRACE_ENABLED:
+                                    other = remaining[0]
+                                    request.add_trace(f"Conflict with assignment {assignment.assignment_id} not preempted: conflict with assignment {other.assignment_id} (node={other.node_id}, freq={other.freq_start}-{other.freq_end}) remains.")
                                 break
                             else:
-                                conflict = True
+                                # Sole conflict and we outrank it: revoke on grant
+                                preempted_assignment = assignment
+                                if TRACE_ENABLED:
+                                    request.add_trace(f"Preempted assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) due to higher priority.")
+                                continue
+                        elif temp_priority > other_priority:
+                            conflict = True
+                            if TRACE_ENABLED:
+                                request.add_trace(f"Conflict with higher-priority assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) not mitigated.")
+                            break
+                        else:
+                            conflict = True
+                            if TRACE_ENABLED:
                                 request.add_trace(f"Conflict with assignment {assignment.assignment_id} (node={assignment.node_id}, freq={assignment.freq_start}-{assignment.freq_end}) not mitigated.")
-                                break
+                            break
                 if not conflict:
                     if preempted_assignment is not None:
                         self._remove_assignment(preempted_assignment)
                     if self.query_interval != float('inf'):
-                        temp_assignment = Assignment(
-                            assignment_id=self.next_assignment_id,
-                            node_id=request.node_id,
-                            freq_start=freq_start,
-                            freq_end=freq_end,
-                            device_type=request.device_type,
-                            priority_tier=self._get_priority_tier(request.device_type),
-                            next_check_tick=current_tick + self.query_interval
-                        )
+                        # Reuse the conflict-tested assignment rather than
+                        # constructing a second identical one; this also
+                        # keeps any mitigation-reduced quality, which the
+                        # old rebuild silently reset to 1.0
+                        temp_assignment.next_check_tick = current_tick + self.query_interval
                     self._add_assignment(temp_assignment)
                     self.next_assignment_id += 1
                     assignment_made = True
@@ -261,7 +472,8 @@ class SpectrumManager:
                     self.metrics.add_quality_measurement(temp_assignment.quality)
                     request.is_assigned = True
                     request.reject_reason = None
-                    request.add_trace(f"Granted at time {current_tick}: freq=({freq_start}-{freq_end})")
+                    if TRACE_ENABLED:
+                        request.add_trace(f"Granted at time {current_tick}: freq=({freq_start}-{freq_end})")
                     request.assigned_freq = (freq_start, freq_end)
                     break
             if not assignment_made:
@@ -269,48 +481,71 @@ class SpectrumManager:
                 self.metrics.requests_denied += 1
                 request.is_assigned = False
                 request.reject_reason = "conflict or no candidates"
-                request.add_trace(f"Denied at time {current_tick}: conflict or no candidates")
+                if TRACE_ENABLED:
+                    request.add_trace(f"Denied at time {current_tick}: conflict or no candidates")
     
     def renew_assignments(self, current_tick):
         """
         Renew assignments that are due for review.
         For Dynamic mode: count query cost for ALL active assignments every tick, but only reprocess those due for review.
+        Due assignments are popped from the renewal min-heap instead of
+        scanning every active assignment per tick; stale heap entries are
+        discarded lazily on pop.
         Args:
             current_tick: Current simulation tick
         """
+        # Nothing to renew or bill without active assignments (common in
+        # low-demand scenarios); skip the scan entirely
+        if not self.active:
+            return
         assignments_to_remove = []
-        is_dynamic = self.arch_policy.licensing_mode == "Dynamic"
+        # Bind per-iteration lookups to locals for the scans below
+        environment = self.environment
+        arch_policy = self.arch_policy
+        square_to_assignments = self.square_to_assignments
+        metrics = self.metrics
+        renewal_query_cost = self.renewal_query_cost
+        is_dynamic = self._dynamic_mode
         if is_dynamic:
-            for assignment in self.active:
-                self.metrics.coord_queries += self.renewal_query_cost
-        for assignment in list(self.active):  # list() so we can safely remove
-            if assignment.next_check_tick is None or assignment.next_check_tick != current_tick:
-                continue
-            node = self.environment.nodes[assignment.node_id]
-            possible_conflicts = []
+            # Every active assignment is billed per tick; one multiply
+            # replaces the per-assignment accumulation loop
+            metrics.coord_queries += renewal_query_cost * len(self.active)
+        # Pop only assignments actually due from the renewal heap. Entries
+        # whose stored tick no longer matches the assignment are stale
+        # (rescheduled or revoked) and are discarded; ticks already in the
+        # past were missed by the caller and stay unprocessed, as before.
+        heap = self._renewal_heap
+        due_assignments = []
+        while heap and heap[0][0] <= current_tick:
+            tick, _, assignment = heapq.heappop(heap)
+            if assignment.next_check_tick == tick and tick == current_tick:
+                due_assignments.append(assignment)
+        for assignment in due_assignments:
+            node = assignment.node
+            # Merge the covered squares' bucket dicts: gather and dedupe in
+            # one pass, then drop the assignment under review itself
+            merged = self._scratch_merged
+            merged.clear()
             for square in node.covered_squares:
-                possible_conflicts.extend(self.square_to_assignments[square])
-            # Remove self and deduplicate by id
-            seen = set()
+                merged.update(square_to_assignments[square])
+            merged.pop(assignment.assignment_id, None)
             conflict = False
-            for other in possible_conflicts:
-                if other is assignment or id(other) in seen:
-                    continue
-                seen.add(id(other))
-                if assignment.conflicts_with(other, self.environment):
-                    if not assignment.apply_mitigation(other, self.arch_policy, self.environment):
+            for other in merged.values():
+                if assignment.conflicts_with(other, environment):
+                    if not assignment.apply_mitigation(other, arch_policy, environment):
                         conflict = True
                         break
             if not conflict:
                 # Update assignment in place (preserving quality and history)
                 assignment.next_check_tick = current_tick + self.query_interval
+                heapq.heappush(heap, (assignment.next_check_tick, assignment.assignment_id, assignment))
                 # Optionally, keep a history/log if desired (e.g., assignment.history.append(...))
                 if not is_dynamic:
-                    self.metrics.coord_queries += self.renewal_query_cost
+                    metrics.coord_queries += renewal_query_cost
             else:
                 if conflict:
                     assignments_to_remove.append(assignment)
-                    self.metrics.requests_denied += 1
+                    metrics.requests_denied += 1
         # Remove revoked assignments
         for assignment in assignments_to_remove:
             self._remove_assignment(assignment)
@@ -327,12 +562,43 @@ class SpectrumManager:
         self.renew_assignments(current_tick)
         
         # Process manual batch if it's time (daily)
-        if self.arch_policy.licensing_mode == "Manual" and current_tick % 1440 == 0:
+        if self._manual_mode and current_tick % 1440 == 0:
             self._process_manual_batch(current_tick)
         
         # Update usage metrics
         self.metrics.update_usage(self.active, self.environment, 1)
     
+    def tick_housekeeping_range(self, start_tick, end_tick):
+        """
+        Perform housekeeping for the whole range [start_tick, end_tick) by
+        dispatching on event boundaries (due renewals, daily manual batches)
+        instead of looping minute-by-minute. Usage metrics are accumulated in
+        one update_usage call per quiet interval, mirroring the event-driven
+        engine. Intended for coarse-grained paths (e.g. Manual licensing)
+        where no per-minute work happens between events.
+
+        Args:
+            start_tick: First tick of the range (inclusive)
+            end_tick: End of the range (exclusive)
+        """
+        event_ticks = set()
+        for assignment in self.active:
+            if assignment.next_check_tick is not None and start_tick <= assignment.next_check_tick < end_tick:
+                event_ticks.add(assignment.next_check_tick)
+        if self._manual_mode:
+            first_batch = ((start_tick + 1439) // 1440) * 1440
+            event_ticks.update(range(first_batch, end_tick, 1440))
+        last_tick = start_tick
+        for tick in sorted(event_ticks):
+            if tick > last_tick:
+                self.metrics.update_usage(self.active, self.environment, tick - last_tick)
+                last_tick = tick
+            self.renew_assignments(tick)
+            if self._manual_mode and tick % 1440 == 0:
+                self._process_manual_batch(tick)
+        if end_tick > last_tick:
+            self.metrics.update_usage(self.active, self.environment, end_tick - last_tick)
+
     def _process_manual_batch(self, current_tick):
         """
         Process a batch of manual licensing requests.
@@ -373,58 +639,59 @@ class SpectrumManager:
         Returns:
             List of (freq_start, freq_end) tuples
         """
-        candidates = []
         requested_bw = request.requested_bw
+        # The unshuffled candidate set is fully determined by the (fixed)
+        # policy plus the request's device type and bandwidth; reuse the
+        # cached template. Returned lists are in deterministic band order:
+        # process_arrivals randomizes lazily as it walks them.
+        cache_key = (request.device_type, requested_bw)
+        template = self._candidate_cache.get(cache_key)
+        if template is not None:
+            return list(template)
+        # The template build below runs once per cache key: starts come from
+        # a single np.arange and .tolist() converts back to plain-int pairs,
+        # so consumers see the same (freq_start, freq_end) tuples as before
+        # without a Python-level loop allocating them one at a time.
+        starts = None
         # Large Blocks: Always allocate 200 MHz blocks, regardless of requested_bw
         if self.arch_policy.freq_plan == "Large Blocks":
             block_size = 200
+            alloc_bw = block_size
+            step = block_size
             # Only assign if the whole block is available
             if self.arch_policy.priority_mode == "Exclusive":
                 part = self.band_partitions.get(request.device_type)
                 if part is not None:
-                    start_freq = part[0]
-                    while start_freq + block_size <= part[1]:
-                        candidates.append((start_freq, start_freq + block_size))
-                        start_freq += block_size
+                    starts = np.arange(part[0], part[1] - block_size + 1, step, dtype=np.int64)
             else:
-                start_freq = FREQ_BASE_MHZ
-                while start_freq + block_size <= FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ:
-                    candidates.append((start_freq, start_freq + block_size))
-                    start_freq += block_size
+                starts = np.arange(FREQ_BASE_MHZ, FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ - block_size + 1, step, dtype=np.int64)
         # Sub Channels: Use 40 MHz channels, must find enough contiguous channels
         elif self.arch_policy.freq_plan == "Sub Channels":
             channel_size = 40
             num_channels = (requested_bw + channel_size - 1) // channel_size  # ceil division
-            total_channels = TOTAL_BANDWIDTH_MHZ // channel_size
+            alloc_bw = num_channels * channel_size
+            step = channel_size
             if self.arch_policy.priority_mode == "Exclusive":
                 part = self.band_partitions.get(request.device_type)
                 if part is not None:
-                    part_bw = part[1] - part[0]
-                    part_channels = part_bw // channel_size
-                    for start_ch in range(part_channels - num_channels + 1):
-                        freq_start = part[0] + start_ch * channel_size
-                        freq_end = freq_start + num_channels * channel_size
-                        if freq_end <= part[1]:
-                            candidates.append((freq_start, freq_end))
+                    starts = np.arange(part[0], part[1] - alloc_bw + 1, step, dtype=np.int64)
             else:
-                for start_ch in range(total_channels - num_channels + 1):
-                    freq_start = FREQ_BASE_MHZ + start_ch * channel_size
-                    freq_end = freq_start + num_channels * channel_size
-                    if freq_end <= FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ:
-                        candidates.append((freq_start, freq_end))
+                starts = np.arange(FREQ_BASE_MHZ, FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ - alloc_bw + 1, step, dtype=np.int64)
         # Freq Slicing: Allocate exactly requested_bw anywhere in the band
         else:  # "Freq Slicing"
+            alloc_bw = requested_bw
             if self.arch_policy.priority_mode == "Exclusive":
                 part = self.band_partitions.get(request.device_type)
                 if part is not None:
-                    for freq_start in range(part[0], part[1] - requested_bw + 1):
-                        freq_end = freq_start + requested_bw
-                        candidates.append((freq_start, freq_end))
+                    starts = np.arange(part[0], part[1] - requested_bw + 1, dtype=np.int64)
             else:
-                for freq_start in range(FREQ_BASE_MHZ, FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ - requested_bw + 1):
-                    freq_end = freq_start + requested_bw
-                    candidates.append((freq_start, freq_end))
-        random.shuffle(candidates)
+                starts = np.arange(FREQ_BASE_MHZ, FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ - requested_bw + 1, dtype=np.int64)
+        if starts is None:
+            candidates = []
+        else:
+            candidates = [tuple(pair) for pair in
+                          np.stack([starts, starts + alloc_bw], axis=1).tolist()]
+        self._candidate_cache[cache_key] = tuple(candidates)
         return candidates
     
     def _get_priority_tier(self, device_type):
@@ -437,14 +704,4 @@ class SpectrumManager:
         Returns:
             Priority tier (0 = highest)
         """
-        if self.arch_policy.priority_mode == "Hierarchical":
-            # Federal has highest priority (0), then 5G (1), then IoT (2)
-            if device_type == "Federal":
-                return 0
-            elif device_type == "5G":
-                return 1
-            else:  # IoT
-                return 2
-        else:
-            # In Co-Primary or Exclusive, all have same tier
-            return 0
+        return self._tier_map.get(device_type, self._default_tier)
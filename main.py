@@ -5,9 +5,11 @@ main.py
 Entry point for the spectrum sharing simulation.
 """
 
+import os
 import sys
 import random
 import time
+from multiprocessing import Pool
 from config.parameters import RANDOM_SEED
 from config.scenarios import SCENARIOS, DEFAULT_SIM_MINUTES
 from models.environment import Environment
@@ -15,6 +17,7 @@ from core.simulation import Simulation
 from core.event_simulation import EventDrivenSimulation
 from utils.demand_generator import generate_demand
 from morphology.architecture_enumerator import generate_all_architectures, get_architecture_by_name
+from utils.results_io import append_result_row
 
 def run_single_architecture(arch_policy, scenario_key="medium", sim_minutes=DEFAULT_SIM_MINUTES):
     """
@@ -64,6 +67,23 @@ def run_event_driven_architecture(arch_policy, scenario_key="medium", sim_minute
     simulation.save_results(scenario_key)
     return results
 
+def run_one(task):
+    """
+    Top-level worker for parallel sweeps: takes a picklable
+    (arch_policy, scenario_key, env, demand_list, sim_minutes) tuple and
+    returns the results dict. The environment and demand are generated once
+    per scenario by the parent (demand is deterministic under RANDOM_SEED);
+    pickling hands each worker its own private copy, so in-place mutation
+    of requests during the run is safe. Writing results to disk is left to
+    the parent process so workers share no file handles.
+    """
+    arch_policy, scenario_key, env, demand_list, sim_minutes = task
+    random.seed(RANDOM_SEED)
+    simulation = Simulation(env, arch_policy, demand_list, sim_minutes)
+    results = simulation.run()
+    results["scenario"] = scenario_key
+    return results
+
 def run_batch(scenario_keys=None, max_architectures=None):
     """
     Run a batch of simulations for multiple architectures and scenarios.
@@ -81,27 +101,39 @@ def run_batch(scenario_keys=None, max_architectures=None):
     if max_architectures:
         architectures = architectures[:max_architectures]
     
-    total_runs = len(architectures) * len(scenario_keys)
+    # Demand is identical across architectures for a given scenario (fixed
+    # seed, deterministic grid), so generate it once per scenario instead of
+    # once per task
+    demand_cache = {}
+    for scenario_key in scenario_keys:
+        random.seed(RANDOM_SEED)
+        env = Environment(squares_rows=3, squares_cols=3)
+        demand_cache[scenario_key] = (env, generate_demand(scenario_key, env, DEFAULT_SIM_MINUTES))
+
+    tasks = [(arch, scenario_key) + demand_cache[scenario_key] + (DEFAULT_SIM_MINUTES,)
+             for scenario_key in scenario_keys for arch in architectures]
+    total_runs = len(tasks)
     print(f"Running {total_runs} simulations ({len(architectures)} architectures × {len(scenario_keys)} scenarios)")
-    
-    current_run = 0
+
     start_time = time.time()
-    
-    # Run simulations for all combinations
-    for scenario_key in scenario_keys:
-        for arch in architectures:
-            current_run += 1
-            progress = current_run / total_runs * 100
+    csv_path = os.path.join("results", "simulation_results.csv")
+    completed = 0
+
+    # Each run is an independent CPU-bound simulation, so fan the tasks out
+    # across cores. Workers only compute; the CSV writer stays in this
+    # process so rows never interleave.
+    with Pool(processes=os.cpu_count()) as pool:
+        for results in pool.imap_unordered(run_one, tasks, chunksize=8):
+            completed += 1
+            append_result_row(csv_path, results)
+            progress = completed / total_runs * 100
             elapsed = time.time() - start_time
-            eta = (elapsed / current_run) * (total_runs - current_run) if current_run > 0 else 0
-            
+            eta = (elapsed / completed) * (total_runs - completed)
+
             # Print progress
-            arch_id = f"{arch.coordination_mode}-{arch.licensing_mode}-{arch.priority_mode}"
-            print(f"[{progress:.1f}%] Running {arch_id} with {scenario_key} scenario (ETA: {eta:.0f}s)")
-            
-            # Run the simulation
-            run_single_architecture(arch, scenario_key)
-    
+            arch_id = f"{results['coordination_mode']}-{results['licensing_mode']}-{results['priority_mode']}"
+            print(f"[{progress:.1f}%] Finished {arch_id} with {results['scenario']} scenario (ETA: {eta:.0f}s)")
+
     print(f"Batch complete. Total time: {time.time() - start_time:.1f}s")
 
 def main():
@@ -5,7 +5,32 @@ from dataclasses import dataclass
 from typing import Optional, Set
 import numpy as np
 
-@dataclass
+from models.environment import REL_ADJACENT, REL_OPPOSITE
+
+# Quality factors applied when a conflict can be mitigated, keyed by
+# mitigation option and node relationship code (Environment REL_*).
+# Options absent from the table ("No Mitigation", "Frequency Hopping")
+# never resolve a spatial overlap, as do relationships absent from an
+# option's inner map.
+_MITIGATION_QUALITY_FACTORS = {
+    "Power Control": {REL_OPPOSITE: 0.7},
+    "Beamforming": {REL_OPPOSITE: 0.7},
+    "Combination": {REL_OPPOSITE: 0.7, REL_ADJACENT: 0.5},
+}
+
+# Dense form of the table above for batch consumers: one float row per
+# mitigation option indexed by relationship code, NaN where the conflict
+# cannot be mitigated. Lets the SpectrumManager gather quality factors
+# for a whole batch of conflicting pairs in one vectorized lookup.
+MITIGATION_QUALITY_ROWS = {
+    option: np.array([factors.get(rel, np.nan) for rel in range(4)])
+    for option, factors in _MITIGATION_QUALITY_FACTORS.items()
+}
+
+# Relationship names indexed by the Environment REL_* codes
+_REL_NAMES = ("same", "adjacent", "opposite", "none")
+
+@dataclass(slots=True)
 class Assignment:
     """
     Represents a frequency assignment to a node.
@@ -19,6 +44,9 @@ class Assignment:
         quality: Signal quality factor (default=1.0)
         next_check_tick: When to check for renewal (None for permanent)
         priority_tier: Priority level (0 = highest)
+        terminated: Whether the assignment was terminated by mitigation
+        node: The Node instance, cached by the SpectrumManager at grant
+            time so hot loops skip the environment.nodes[node_id] lookup
     """
     assignment_id: int
     node_id: int
@@ -28,6 +56,8 @@ class Assignment:
     quality: float = 1.0
     next_check_tick: Optional[int] = None
     priority_tier: int = 0
+    terminated: bool = False
+    node: Optional[object] = None
     
     def conflicts_with(self, other, environment):
         """
@@ -43,14 +73,19 @@ class Assignment:
         # Check for frequency overlap first (most efficient)
         if self.freq_end <= other.freq_start or self.freq_start >= other.freq_end:
             return False
-            
-        # Get the nodes
-        this_node = environment.nodes[self.node_id]
-        other_node = environment.nodes[other.node_id]
-        
-        # Check for spatial overlap through shared squares
-        shared_squares = this_node.covered_squares.intersection(other_node.covered_squares)
-        return len(shared_squares) > 0
+
+        # Get the nodes: the cached reference set at grant time avoids the
+        # environment.nodes indexing on this hot predicate
+        this_node = self.node
+        if this_node is None:
+            this_node = environment.nodes[self.node_id]
+        other_node = other.node
+        if other_node is None:
+            other_node = environment.nodes[other.node_id]
+
+        # Spatial overlap via the precomputed coverage bitmaps: a single
+        # integer AND instead of hashing through the square sets
+        return (this_node.covered_mask & other_node.covered_mask) != 0
     
     def get_node_relationship(self, other, environment):
         """
@@ -61,38 +96,13 @@ class Assignment:
             environment: The Environment instance containing nodes
             
         Returns:
-            String: "same" if same node, "adjacent" if adjacent nodes, 
+            String: "same" if same node, "adjacent" if adjacent nodes,
                    "opposite" if diagonal/opposite, "none" if no overlap
         """
-        # Get the nodes
-        this_node = environment.nodes[self.node_id]
-        other_node = environment.nodes[other.node_id]
-        
-        # Check if same node
-        if this_node.node_id == other_node.node_id:
-            return "same"
-            
-        # Check for shared squares (if no shared squares, then "none")
-        shared_squares = this_node.covered_squares.intersection(other_node.covered_squares)
-        if not shared_squares:
-            return "none"
-            
-        # Special case for 1-square environment: all nodes overlap, so only diagonally opposite nodes are 'opposite', others are 'adjacent'
-        # Assume square is 2x2 nodes (node IDs: 0,1,2,3) for 1-square environment
-        if len(environment.nodes) == 4 and len(shared_squares) == 1:
-            pairs_opposite = {(0,3), (3,0), (1,2), (2,1)}
-            if (this_node.node_id, other_node.node_id) in pairs_opposite:
-                return "opposite"
-            else:
-                return "adjacent"
-        # Calculate Manhattan distance between nodes
-        manhattan_dist = abs(this_node.row - other_node.row) + abs(this_node.col - other_node.col)
-        # Adjacent nodes are 1 unit away (either same row or same column)
-        if manhattan_dist == 1:
-            return "adjacent"
-        # Diagonal/opposite nodes are either 2 units away diagonally or across a square 
-        else:
-            return "opposite"
+        # The geometry rules (shared squares, Manhattan distance, the
+        # 1-square special case) are precomputed pairwise by the
+        # environment; per call this is one table read
+        return _REL_NAMES[environment.pair_relationship(self.node_id, other.node_id)]
     
     def apply_mitigation(self, other, arch_policy, environment):
         """
@@ -107,45 +117,19 @@ class Assignment:
             True if assignments can coexist (with possible quality reduction),
             False if they still conflict
         """
-        mitigation = arch_policy.interference_mitigation
-        # No mitigation - assignments still conflict
-        if mitigation == "No Mitigation":
+        factors = _MITIGATION_QUALITY_FACTORS.get(arch_policy.interference_mitigation)
+        if factors is None:
+            # No Mitigation / Frequency Hopping - assignments still conflict
             return False
-        relationship = self.get_node_relationship(other, environment)
-        if mitigation == "Power Control":
-            if relationship == "opposite":
-                quality_factor = 0.7
-                self.quality *= quality_factor
-                other.quality *= quality_factor
-                return True
-            else:
-                return False
-        elif mitigation == "Beamforming":
-            if relationship == "opposite":
-                quality_factor = 0.7
-                self.quality *= quality_factor
-                other.quality *= quality_factor
-                return True
-            else:
-                return False
-        elif mitigation == "Combination":
-            if relationship == "opposite":
-                quality_factor = 0.7
-                self.quality *= quality_factor
-                other.quality *= quality_factor
-                return True
-            elif relationship == "adjacent":
-                quality_factor = 0.5
-                self.quality *= quality_factor
-                other.quality *= quality_factor
-                return True
-            else:
-                return False
-        # Frequency hopping doesn't resolve spatial overlap directly
-        if mitigation == "Frequency Hopping":
+        # Dispatch on the integer relationship code straight from the
+        # environment's pairwise table, skipping the code->name round trip
+        rel = environment.pair_relationship(self.node_id, other.node_id)
+        quality_factor = factors.get(int(rel))
+        if quality_factor is None:
             return False
-        # Default - still conflict
-        return False
+        self.quality *= quality_factor
+        other.quality *= quality_factor
+        return True
 
     def __repr__(self):
         return (f"<Assignment id={self.assignment_id} node={self.node_id} "
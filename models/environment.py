@@ -3,8 +3,12 @@ Defines the simulation environment.
 It consists of a grid of squares. Nodes are placed at the intersections.
 You can specify the number of squares (rows and columns) to allow scaling.
 """
+import numpy as np
 from models.node import Node
 
+# Integer codes for the pairwise node-relationship table
+REL_SAME, REL_ADJACENT, REL_OPPOSITE, REL_NONE = 0, 1, 2, 3
+
 class Environment:
     def __init__(self, squares_rows=1, squares_cols=1):
         self.squares_rows = squares_rows
@@ -12,6 +16,107 @@ class Environment:
         self.num_nodes_rows = squares_rows + 1
         self.num_nodes_cols = squares_cols + 1
         self.nodes = self.generate_nodes()
+        # Flat view of all active assignments. The SpectrumManager rebinds
+        # this to its own live list, so environment-only consumers (metrics,
+        # scripts) can iterate assignments without a per-node gather.
+        self.active_assignments = []
+        # Pairwise node tables (spatial overlap and relationship codes).
+        # Built lazily on first use because scripts may replace self.nodes
+        # after construction; see pair_relationship().
+        self._pair_rel = None
+        self._pair_overlap = None
+        # SoA mirrors of the per-node grid position and coverage bitmap,
+        # built alongside the pair tables; batch consumers index these
+        # instead of chasing attributes through the Node list
+        self.node_rows = None
+        self.node_cols = None
+        self.node_masks = None
+        # Precomputed adjacency: neighbor id tuples per node, so
+        # get_neighbors stops rebuilding the direction list and bounds
+        # checks on every call. Scripts that change the topology patch
+        # get_neighbors itself, which shadows this table.
+        self._neighbors = [tuple(self._compute_neighbors(node_id))
+                           for node_id in range(len(self.nodes))]
+
+    def _build_pair_tables(self):
+        """Precompute the NxN node-relationship code table so per-pair
+        checks reduce to one indexed read instead of re-deriving Manhattan
+        distance and shared squares each call. Node ids are assumed to be
+        0..N-1 (as generate_nodes produces)."""
+        nodes = self.nodes
+        n = len(nodes)
+        # SoA gather of the node fields the table derives from
+        rows = np.fromiter((node.row for node in nodes), np.int16, n)
+        cols = np.fromiter((node.col for node in nodes), np.int16, n)
+        masks = [node.covered_mask for node in nodes]
+        self.node_rows = rows
+        self.node_cols = cols
+        self.node_masks = masks
+        # Spatial overlap: pairwise AND of the coverage bitmaps. Grids of
+        # up to 64 squares fit uint64 and go through one broadcast AND;
+        # larger masks fall back to the Python big-int loop.
+        if n and max(masks) < 2 ** 64:
+            mask_arr = np.array(masks, dtype=np.uint64)
+            overlap = (mask_arr[:, None] & mask_arr[None, :]) != 0
+        else:
+            overlap = np.array([[bool(a & b) for b in masks] for a in masks],
+                               dtype=bool).reshape(n, n)
+        # Relationship codes, vectorized: same node on the diagonal, no
+        # shared square -> none, otherwise adjacent at Manhattan distance 1
+        # and opposite beyond
+        manhattan = (np.abs(rows[:, None] - rows[None, :])
+                     + np.abs(cols[:, None] - cols[None, :]))
+        rel = np.where(manhattan == 1, REL_ADJACENT, REL_OPPOSITE)
+        rel = np.where(overlap, rel, REL_NONE).astype(np.int8)
+        np.fill_diagonal(rel, REL_SAME)
+        # Special case for 1-square environments (2x2 nodes): every pair
+        # overlaps, so only diagonally opposite nodes are "opposite"
+        if n == 4:
+            pairs_opposite = {(0, 3), (3, 0), (1, 2), (2, 1)}
+            for a in nodes:
+                for b in nodes:
+                    i, j = a.node_id, b.node_id
+                    if i != j and overlap[i, j] and len(a.covered_squares & b.covered_squares) == 1:
+                        rel[i, j] = REL_OPPOSITE if (i, j) in pairs_opposite else REL_ADJACENT
+        self._pair_rel = rel
+        # Any relationship other than "none" implies a shared square
+        self._pair_overlap = rel != REL_NONE
+
+    def pair_relationship(self, node_id, other_id):
+        """Relationship code (REL_*) between two nodes, from the
+        precomputed pairwise table."""
+        rel = self._pair_rel
+        if rel is None or node_id >= rel.shape[0] or other_id >= rel.shape[0]:
+            self._build_pair_tables()
+            rel = self._pair_rel
+        return rel[node_id, other_id]
+
+    def pair_relationships(self, node_id, other_ids):
+        """Vector form of pair_relationship: relationship codes between
+        node_id and each id in the given array, gathered in one read."""
+        rel = self._pair_rel
+        if rel is None or node_id >= rel.shape[0] or (len(other_ids) and int(other_ids.max()) >= rel.shape[0]):
+            self._build_pair_tables()
+            rel = self._pair_rel
+        return rel[node_id][other_ids]
+
+    def find_conflicts(self, freq_start, freq_end, node_id, assignments):
+        """
+        Vectorized batch form of Assignment.conflicts_with: return the
+        indices of the given assignments that overlap [freq_start,
+        freq_end) in frequency and share a square with node_id. One
+        C-level sweep replaces a Python call per assignment.
+        """
+        n = len(assignments)
+        if not n:
+            return np.empty(0, dtype=np.intp)
+        if self._pair_rel is None or node_id >= self._pair_rel.shape[0]:
+            self._build_pair_tables()
+        lows = np.fromiter((a.freq_start for a in assignments), np.int64, n)
+        highs = np.fromiter((a.freq_end for a in assignments), np.int64, n)
+        node_ids = np.fromiter((a.node_id for a in assignments), np.intp, n)
+        mask = (lows < freq_end) & (highs > freq_start) & self._pair_overlap[node_id][node_ids]
+        return np.nonzero(mask)[0]
 
     def generate_nodes(self):
         nodes = []
@@ -38,10 +143,7 @@ class Environment:
         for node in self.nodes:
             node.remove_expired_assignments(current_time)
 
-    def get_neighbors(self, node_id):
-        """
-        Returns the node_ids of all immediate neighbors (up, down, left, right) for the given node_id.
-        """
+    def _compute_neighbors(self, node_id):
         node = self.nodes[node_id]
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # up, down, left, right
         neighbors = []
@@ -53,6 +155,14 @@ class Environment:
                     neighbors.append(neighbor_id)
         return neighbors
 
+    def get_neighbors(self, node_id):
+        """
+        Returns the node_ids of all immediate neighbors (up, down, left, right) for the given node_id.
+        The grid is static after construction, so the adjacency lists are
+        precomputed once and each call is a plain index.
+        """
+        return self._neighbors[node_id]
+
     @property
     def num_squares(self):
         return self.squares_rows * self.squares_cols
\ No newline at end of file
@@ -2,16 +2,49 @@
 Defines a Node representing a location.
 Each node is placed in a grid (with row and col) and “covers” one or more squares.
 """
+# Sentinel end time for assignments that never expire
+_NO_EXPIRY = float('inf')
+
 class Node:
+    # Slots keep per-node memory down (no per-instance __dict__) and make
+    # the attribute loads in the conflict hot path fixed-offset
+    __slots__ = ("node_id", "row", "col", "covered_squares", "area_km2",
+                 "covered_mask", "active_assignments", "_min_end")
+
     def __init__(self, node_id, row, col, covered_squares):
         self.node_id = node_id
         self.row = row
         self.col = col
-        self.covered_squares = set(covered_squares)  # set of square IDs this node touches
+        # Frozen: the coverage footprint never changes after construction, so
+        # every consumer can share this one set instead of re-deriving it
+        self.covered_squares = frozenset(covered_squares)  # square IDs this node touches
+        # Cached coverage area (1 km² per square); anything that reassigns
+        # covered_squares must refresh this too
+        self.area_km2 = len(self.covered_squares)
+        # Bitmap of the footprint (square ID -> bit): two masks overlap iff
+        # their AND is non-zero, one integer op instead of a set probe
+        self.covered_mask = 0
+        for square in self.covered_squares:
+            self.covered_mask |= 1 << square
         self.active_assignments = []  # list of SpectrumAssignment objects
+        # Earliest end time among live assignments: lets the per-tick
+        # expiry sweep bail out in O(1) when nothing can have expired yet
+        self._min_end = _NO_EXPIRY
 
     def add_assignment(self, assignment):
         self.active_assignments.append(assignment)
+        end_time = getattr(assignment, 'end_time', _NO_EXPIRY)
+        if end_time < self._min_end:
+            self._min_end = end_time
 
     def remove_expired_assignments(self, current_time):
-        self.active_assignments = [a for a in self.active_assignments if current_time < a.end_time]
\ No newline at end of file
+        # Most ticks expire nothing; the cached minimum end time turns
+        # those into a single comparison instead of a scan
+        if self._min_end > current_time:
+            return
+        self.active_assignments = [
+            a for a in self.active_assignments
+            if getattr(a, 'end_time', _NO_EXPIRY) > current_time
+        ]
+        self._min_end = min((getattr(a, 'end_time', _NO_EXPIRY)
+                             for a in self.active_assignments), default=_NO_EXPIRY)
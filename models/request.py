@@ -7,6 +7,16 @@ It also maintains a trace log of its lifecycle.
 """
 
 class SpectrumRequest:
+    # Slots keep per-request memory down (no per-instance __dict__) across
+    # the millions of requests a long scenario generates. Fields that are
+    # only attached later (manual-mode delays, frequency picks) are declared
+    # here too so they can still be assigned; they stay unset until then,
+    # preserving hasattr/getattr-with-default checks on the hot paths.
+    __slots__ = ('req_id', 'arrival_time', 'node_id', 'requested_bw',
+                 'device_type', 'is_assigned', 'reject_reason', 'trace',
+                 'manual_delay', 'process_time', 'assigned_freq',
+                 'desired_frequency', 'freq_start', 'freq_end')
+
     def __init__(self, req_id, arrival_time, node_id, requested_bw, device_type):
         self.req_id = req_id                  # Unique request ID
         self.arrival_time = arrival_time      # Time (in minutes) when the request arrives
@@ -18,6 +28,8 @@ class SpectrumRequest:
         self.trace = []                       # records events for the request
 
     def add_trace(self, message):
+        # Callers gate on config.parameters.TRACE_ENABLED so the f-string
+        # arguments are never even formatted in non-debug batch runs
         self.trace.append(message)
 
     def __repr__(self):
@@ -35,7 +35,10 @@ def generate_all_architectures(apply_filter=True):
     Returns a list of ArchitecturePolicy instances.
     """
     all_architectures = []
-    # Generate combinations across all eight dimensions
+    # Generate combinations across all eight dimensions. Feasibility is
+    # decided on the raw tuples so ArchitecturePolicy objects are only
+    # constructed for combinations that survive the filter, instead of
+    # allocating ~12k policies just to discard most of them.
     for combo in itertools.product(COORDINATION_MODES,
                                    LICENSING_MODES,
                                    FREQ_PLANS,
@@ -44,21 +47,36 @@ def generate_all_architectures(apply_filter=True):
                                    PRICING_MODES,
                                    ENFORCEMENT_MODES,
                                    PRIORITY_MODES):
-        arch = ArchitecturePolicy(coordination_mode=combo[0],
-                                  licensing_mode=combo[1],
-                                  freq_plan=combo[2],
-                                  interference_mitigation=combo[3],
-                                  sensing_mode=combo[4],
-                                  pricing_mode=combo[5],
-                                  enforcement_mode=combo[6],
-                                  priority_mode=combo[7])
-        if apply_filter:
-            if is_feasible(arch):
-                all_architectures.append(arch)
-        else:
-            all_architectures.append(arch)
+        if apply_filter and not _combo_is_feasible(combo[0], combo[1], combo[4],
+                                                   combo[5], combo[6], combo[7]):
+            continue
+        all_architectures.append(
+            ArchitecturePolicy(coordination_mode=combo[0],
+                               licensing_mode=combo[1],
+                               freq_plan=combo[2],
+                               interference_mitigation=combo[3],
+                               sensing_mode=combo[4],
+                               pricing_mode=combo[5],
+                               enforcement_mode=combo[6],
+                               priority_mode=combo[7]))
     return all_architectures
 
+def _combo_is_feasible(coordination, licensing, sensing, pricing, enforcement, priority):
+    """Feasibility rules (see is_feasible) expressed on the raw option
+    values, so enumeration can filter before building policy objects.
+    freq_plan and interference_mitigation never affect feasibility."""
+    if licensing == "Dynamic":
+        # Rules 1, 2 and 5
+        if sensing == "Database Only" or pricing == "Auction Based" or enforcement == "Passive":
+            return False
+    # Rule 3
+    if coordination == "Decentralized" and pricing == "Auction Based":
+        return False
+    # Rule 4
+    if priority == "Exclusive" and (licensing != "Manual" or coordination != "Centralized"):
+        return False
+    return True
+
 def is_feasible(arch):
     """
     Returns True if the given architecture combination is feasible.
@@ -69,27 +87,9 @@ def is_feasible(arch):
       4. If priority is Exclusive, licensing must be Manual and coordination must be Centralized; otherwise that combo is infeasible.
       5. Dynamic licensing may not be paired with Passive enforcement.
     """
-    # Rule 1: Dynamic licensing may not be used with Database Only sensing.
-    if arch.licensing_mode == "Dynamic" and arch.sensing_mode == "Database Only":
-        return False
-    
-    # Rule 2: Dynamic licensing may not be paired with Auction Based pricing.
-    if arch.licensing_mode == "Dynamic" and arch.pricing_mode == "Auction Based":
-        return False
-    
-    # Rule 3: Decentralized coordination may not be paired with Auction Based pricing.
-    if arch.coordination_mode == "Decentralized" and arch.pricing_mode == "Auction Based":
-        return False
-    
-    # Rule 4: If priority is Exclusive, licensing must be Manual and coordination must be Centralized; otherwise that combo is infeasible.
-    if arch.priority_mode == "Exclusive" and (arch.licensing_mode != "Manual" or arch.coordination_mode != "Centralized"):
-        return False
-    
-    # Rule 5: Dynamic licensing may not be paired with Passive enforcement.
-    if arch.licensing_mode == "Dynamic" and arch.enforcement_mode == "Passive":
-        return False
-    
-    return True
+    return _combo_is_feasible(arch.coordination_mode, arch.licensing_mode,
+                              arch.sensing_mode, arch.pricing_mode,
+                              arch.enforcement_mode, arch.priority_mode)
 
 def get_architecture_by_name(coord_mode, licensing, freq_plan, interference, sensing, pricing, enforcement, priority):
     """
@@ -113,6 +113,13 @@ def get_architecture_by_name(coord_mode, licensing, freq_plan, interference, sen
     return arch
 
 class ArchitecturePolicy:
+    # Slots avoid a per-instance __dict__; with thousands of policies alive
+    # during a sweep that is a real memory saving, and attribute reads in
+    # the per-request hot paths become fixed-offset loads
+    __slots__ = ("coordination_mode", "licensing_mode", "freq_plan",
+                 "interference_mitigation", "sensing_mode", "pricing_mode",
+                 "enforcement_mode", "priority_mode")
+
     def __init__(self, coordination_mode, licensing_mode, freq_plan, interference_mitigation, 
                  sensing_mode, pricing_mode, enforcement_mode, priority_mode):
         self.coordination_mode = coordination_mode             # "Centralized", "Decentralized", "Hybrid"
@@ -1,8 +1,18 @@
 """
 Implements frequency allocation strategies for different frequency plans.
+Conflict scans over active assignments run on NumPy arrays gathered once per
+call, instead of per-candidate Python loops over assignment objects.
 """
+import numpy as np
 from config.parameters import TOTAL_BANDWIDTH_MHZ, FREQ_BASE_MHZ
 
+def _gather_bounds(active_assignments):
+    """Collect (freq_starts, freq_ends) of the assignments as int64 arrays."""
+    n = len(active_assignments)
+    starts = np.fromiter((a.freq_start for a in active_assignments), dtype=np.int64, count=n)
+    ends = np.fromiter((a.freq_end for a in active_assignments), dtype=np.int64, count=n)
+    return starts, ends
+
 class LargeBlockAllocator:
     def __init__(self, block_size=200):
         self.block_size = block_size
@@ -10,15 +20,11 @@ class LargeBlockAllocator:
     def find_allocation(self, active_assignments, requested_bw, arch_policy):
         if requested_bw > self.block_size:
             return None  # Request exceeds block size.
-        available_blocks = []
+        used = {(a.freq_start, a.freq_end) for a in active_assignments}
         num_blocks = TOTAL_BANDWIDTH_MHZ // self.block_size
         for i in range(num_blocks):
             start = FREQ_BASE_MHZ + i * self.block_size
-            available_blocks.append((start, start + self.block_size))
-        used = []
-        for assignment in active_assignments:
-            used.append((assignment.freq_start, assignment.freq_end))
-        for block in available_blocks:
+            block = (start, start + self.block_size)
             if block not in used:
                 return block
         return None
@@ -28,38 +34,41 @@ class SubChannelAllocator:
         self.channel_size = channel_size
 
     def find_allocation(self, active_assignments, requested_bw, arch_policy):
+        starts, ends = _gather_bounds(active_assignments)
         num_channels = TOTAL_BANDWIDTH_MHZ // self.channel_size
-        channels = []
-        for i in range(num_channels):
-            start = FREQ_BASE_MHZ + i * self.channel_size
-            channels.append((start, start + self.channel_size))
         needed_channels = -(-requested_bw // self.channel_size)  # Ceiling division.
         for i in range(num_channels - needed_channels + 1):
-            candidate = channels[i:i+needed_channels]
-            candidate_block = (candidate[0][0], candidate[-1][1])
-            conflict = False
-            for assignment in active_assignments:
-                if not (assignment.freq_end < candidate_block[0] or assignment.freq_start > candidate_block[1]):
-                    conflict = True
-                    break
-            if not conflict:
-                return candidate_block
+            lo = FREQ_BASE_MHZ + i * self.channel_size
+            hi = lo + needed_channels * self.channel_size
+            # Same overlap test as before, evaluated as one vector op
+            if not np.any((ends >= lo) & (starts <= hi)):
+                return (lo, hi)
         return None
 
+# Scratch buffer for the slicing sweep, allocated once at import so the
+# per-call cost is a memset of a slice rather than a fresh allocation
+_FORBIDDEN_SCRATCH = np.zeros(TOTAL_BANDWIDTH_MHZ + 1, dtype=bool)
+
 class FreqSlicingAllocator:
     def find_allocation(self, active_assignments, requested_bw, arch_policy):
-        start = FREQ_BASE_MHZ
-        while start + requested_bw <= FREQ_BASE_MHZ + TOTAL_BANDWIDTH_MHZ:
-            candidate = (start, start + requested_bw)
-            conflict = False
-            for assignment in active_assignments:
-                if not (assignment.freq_end < candidate[0] or assignment.freq_start > candidate[1]):
-                    conflict = True
-                    break
-            if not conflict:
-                return candidate
-            start += 1  # Shift by 1 MHz.
-        return None
+        max_start = TOTAL_BANDWIDTH_MHZ - requested_bw
+        if max_start < 0:
+            return None
+        starts, ends = _gather_bounds(active_assignments)
+        # Mark every forbidden start offset in one pass: candidate start s
+        # conflicts with assignment a iff a.start - bw <= s <= a.end
+        forbidden = _FORBIDDEN_SCRATCH[:max_start + 1]
+        forbidden[:] = False
+        lo = np.maximum(starts - FREQ_BASE_MHZ - requested_bw, 0)
+        hi = np.minimum(ends - FREQ_BASE_MHZ, max_start)
+        for l, h in zip(lo, hi):
+            if l <= h:
+                forbidden[l:h + 1] = True
+        free = np.flatnonzero(~forbidden)
+        if free.size == 0:
+            return None
+        start = FREQ_BASE_MHZ + int(free[0])
+        return (start, start + requested_bw)
 
 def get_frequency_allocator(freq_plan):
     if freq_plan == "Large_Blocks":
@@ -69,4 +78,4 @@ def get_frequency_allocator(freq_plan):
     elif freq_plan == "Freq-Slicing":
         return FreqSlicingAllocator()
     else:
-        return None
\ No newline at end of file
+        return None
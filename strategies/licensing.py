@@ -3,15 +3,30 @@ Defines licensing strategies.
 Manual licensing introduces a random delay (in whole days),
 while automated licensing is immediate.
 """
-import random
-from config.parameters import MANUAL_MIN_DELAY, MANUAL_MAX_DELAY, AUTOMATED_DELAY
+import numpy as np
+from config.parameters import MANUAL_MIN_DELAY, MANUAL_MAX_DELAY, AUTOMATED_DELAY, RANDOM_SEED
 
 class ManualLicensing:
+    # Delays are drawn in batches from NumPy's generator, which is much
+    # cheaper per sample than one random.randint call per request.
+    _BATCH_SIZE = 1024
+
+    def __init__(self):
+        self._rng = np.random.default_rng(RANDOM_SEED)
+        self._delays = np.empty(0, dtype=np.int64)
+        self._cursor = 0
+
     def get_licensing_delay(self, request):
         # Return delay in minutes, ensuring it is a multiple of a day.
-        delay = random.randint(MANUAL_MIN_DELAY, MANUAL_MAX_DELAY)
+        if self._cursor >= len(self._delays):
+            self._delays = self._rng.integers(
+                MANUAL_MIN_DELAY, MANUAL_MAX_DELAY + 1,
+                size=self._BATCH_SIZE, dtype=np.int64)
+            self._cursor = 0
+        delay = int(self._delays[self._cursor])
+        self._cursor += 1
         return delay
 
 class AutomatedLicensing:
     def get_licensing_delay(self, request):
-        return AUTOMATED_DELAY
\ No newline at end of file
+        return AUTOMATED_DELAY
@@ -15,6 +15,7 @@ The scenario key specifies which demand pattern to use.
 """
 
 import random
+import numpy as np
 from models.request import SpectrumRequest
 from config.parameters import FREQ_BASE_MHZ, TOTAL_BANDWIDTH_MHZ
 from config.scenarios import SCENARIOS, DEFAULT_SIM_MINUTES
@@ -42,8 +43,10 @@ def generate_demand(scenario_key, environment, sim_minutes=DEFAULT_SIM_MINUTES,
     demand_list = []
     request_id = 0
     
-    # Filter the arrival minutes to those within the simulation horizon
-    arrival_minutes = [t for t in scenario.arrival_minutes if t < sim_minutes]
+    # Filter the arrival minutes to those within the simulation horizon.
+    # The scenario array is sorted, so slice via binary search instead of scanning.
+    cutoff = np.searchsorted(scenario.arrival_minutes, sim_minutes)
+    arrival_minutes = scenario.arrival_minutes[:cutoff].tolist()
 
     # --- Dynamic demand scaling based on pricing_mode ---
     pricing_mult = 1.0
@@ -1,6 +1,20 @@
+"""
+Deferred-formatting event log.
+Events are stored as (template, args) tuples and only rendered to strings
+when the log is actually read, so hot paths never pay for f-string work.
+"""
+
 class SimulationLogger:
     def __init__(self):
         self.events = []
-    def log_event(self, message):
-        self.events.append(message)
-        # print(message)
+
+    def log_event(self, template, *args):
+        # Store the raw template and args; formatting happens lazily.
+        self.events.append((template, args))
+
+    def format_event(self, entry):
+        template, args = entry
+        return template % args if args else template
+
+    def formatted_events(self):
+        return [self.format_event(entry) for entry in self.events]
@@ -0,0 +1,48 @@
+# utils/results_io.py
+"""
+Cached CSV writers for simulation result rows.
+A sweep saves one row per scenario; opening, writing and closing the file
+for every row pays the syscall sequence thousands of times. Writers are
+opened once per path, reused for every subsequent row, and closed at
+interpreter exit.
+"""
+import atexit
+import csv
+import os
+
+# path -> (file handle, DictWriter); populated lazily on first write
+_writer_cache = {}
+
+
+def append_result_row(csv_path, row):
+    """
+    Append one result row to csv_path, opening the file and writing the
+    header only on the first call for that path in this process.
+
+    Args:
+        csv_path: Destination CSV file path
+        row: Dict of column name -> value; the first row fixes the columns
+    """
+    entry = _writer_cache.get(csv_path)
+    if entry is None:
+        dir_name = os.path.dirname(csv_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        write_header = not os.path.isfile(csv_path)
+        csvfile = open(csv_path, 'a', newline='')
+        writer = csv.DictWriter(csvfile, fieldnames=list(row.keys()))
+        if write_header:
+            writer.writeheader()
+        entry = (csvfile, writer)
+        _writer_cache[csv_path] = entry
+    entry[1].writerow(row)
+
+
+def close_all():
+    """Flush and close every cached writer (registered to run at exit)."""
+    for csvfile, _ in _writer_cache.values():
+        csvfile.close()
+    _writer_cache.clear()
+
+
+atexit.register(close_all)